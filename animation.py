@@ -0,0 +1,67 @@
+from array import array
+
+import arcade
+
+
+class PhaseClock:
+    """
+    A keyframe clock driven by delta_time. One clock drives every sprite that
+    animates in step, such as a whole sprite list, so a frame with no
+    keyframe change costs the same however many sprites there are.
+    """
+
+    def __init__(self, frame_time, frame_count):
+        self.frame_time = frame_time
+        self.frame_count = frame_count
+        self.reset()
+
+    def reset(self):
+        self.time = 0.0
+        self.frame = 0
+
+    def advance(self, delta_time):
+        # True when the keyframe changed, having skipped any a long frame stepped over
+        self.time += delta_time
+        if self.time < self.frame_time:
+            return False
+        steps = int(self.time // self.frame_time)
+        self.time -= steps * self.frame_time
+        self.frame = (self.frame + steps) % self.frame_count
+        return True
+
+
+class KeyframeSpriteList(arcade.SpriteList):
+    """
+    A SpriteList whose sprites all show one keyframe. set_keyframe() points
+    every sprite's texture slot at it by rewriting the list's texture buffer
+    in one array operation, without touching the sprites, so a swap costs
+    the same however many sprites the list holds and nothing is re-hashed.
+    The frames need one size and hit box (see textures.uniform_keyframes).
+    Each sprite keeps the texture it was added with; only what is drawn
+    changes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.keyframe = None
+
+    def set_keyframe(self, texture):
+        self.keyframe = texture
+        # Without a GL context nothing is drawn; sprites pick the keyframe up once the list is initialised
+        if self._initialized:
+            slot, _ = self._atlas.add(texture)
+            self._sprite_texture_data = array("f", [slot]) * len(self._sprite_texture_data)
+            self._sprite_texture_changed = True
+
+    def update_texture(self, sprite):
+        # A sprite added, or re-textured, after the last swap shows the keyframe too
+        super().update_texture(sprite)
+        if self.keyframe is not None and self._initialized and sprite in self.sprite_slot:
+            slot, _ = self._atlas.add(self.keyframe)
+            self._sprite_texture_data[self.sprite_slot[sprite]] = slot
+
+
+def animate_list(sprite_list, clock, textures, delta_time):
+    # Swap a KeyframeSpriteList to the clock's keyframe, only when it changes
+    if clock.advance(delta_time):
+        sprite_list.set_keyframe(textures[clock.frame])
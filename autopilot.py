@@ -0,0 +1,223 @@
+"""
+Soak test: the autopilot plays game after game headlessly, as fast as the
+simulation can step, and reports how long it survived and how long steps
+took.
+
+    python autopilot.py --minutes 60 --seed 1 --max-p99-ms 1
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+
+from constants import (
+    AUTOPILOT_HORIZON,
+    AUTOPILOT_MARGIN,
+    AUTOPILOT_SURF_HEIGHT,
+    JUMP_SPEED,
+    SIMULATION_DT,
+    SURF_SPEED,
+)
+from collision import polygons_intersecting
+from hitboxes import adjusted_hit_box, hit_box_bounds
+from simulation import Actions, GameStates, MonkeyStates, Simulation
+
+
+class Autopilot:
+    """
+    Plays the game from the simulation's own sprite lists. Before each step
+    it predicts the monkey's hit box over the next AUTOPILOT_HORIZON seconds
+    against the obstacles and birds coming up, and jumps on the last step
+    from which a jump clears them, holding SPACE until it lands. While
+    surfing it steers with UP and DOWN to stay at AUTOPILOT_SURF_HEIGHT,
+    between the plants and the birds.
+
+    Inputs go through press and release, the simulation's own by default;
+    the window passes its key handlers, so the autopilot is taken exactly
+    the way a player's keys are. Set it as Simulation.autopilot to have it
+    play every step.
+    """
+
+    def __init__(self, sim, press=None, release=None, horizon=AUTOPILOT_HORIZON, dt=SIMULATION_DT):
+        self.sim = sim
+        self.press = press or sim.press
+        self.release = release or sim.release
+        self.steps = round(horizon / dt)
+        self.dt = dt
+
+    def update(self):
+        sim = self.sim
+        player = sim.player_sprite
+        if sim.game_state == GameStates.GAMEOVER:
+            # Letting go of a key starts the next game in the window
+            self.release(Actions.JUMP)
+        elif sim.monkey_state == MonkeyStates.SURFING:
+            self.surf()
+        elif sim.monkey_state == MonkeyStates.JUMPING:
+            if player.change_y == 0 and sim.physics_engine.can_jump():
+                # Landed, so let go of SPACE
+                self.release(Actions.JUMP)
+        else:
+            threat = self.first_hit()
+            # Jump on the last step from which a jump carries the monkey over what it would run into
+            if threat and not self.first_hit(0.0, threat) and self.first_hit(self.dt, threat):
+                self.press(Actions.JUMP)
+
+    def surf(self):
+        player = self.sim.player_sprite
+        bottom = hit_box_bounds(player)[2]
+        # Turn back within a step's travel of the surfing height
+        tolerance = SURF_SPEED * self.dt
+        if bottom < AUTOPILOT_SURF_HEIGHT - tolerance and player.change_y <= 0:
+            action = Actions.UP
+        elif bottom > AUTOPILOT_SURF_HEIGHT + tolerance and player.change_y >= 0:
+            action = Actions.DOWN
+        else:
+            return
+        self.press(action)
+        self.release(action)
+
+    def threats(self, left, right, steps):
+        # Hit boxes and their bounds, of the obstacles and birds the monkey reaches within steps
+        reach = right + self.sim.player_speed * steps * self.dt
+        threats = []
+        for sprite_list in (self.sim.obstacles_list, self.sim.birds_list):
+            for sprite in sprite_list:
+                bounds = hit_box_bounds(sprite)
+                if bounds[1] > left and bounds[0] < reach:
+                    threats.append((bounds, adjusted_hit_box(sprite)))
+        return threats
+
+    def floors(self, left, right, steps):
+        # (left, right, top) of the platforms the monkey reaches within steps, and the ground under everything
+        reach = right + self.sim.player_speed * steps * self.dt
+        floors = [(float("-inf"), float("inf"), self.sim.physics_engine.ground_top)]
+        for platform in self.sim.floating_platform_list:
+            p_left, p_right, p_bottom, p_top = hit_box_bounds(platform)
+            if p_right > left and p_left < reach:
+                floors.append((p_left, p_right, p_top))
+        return floors
+
+    def first_hit(self, jump_after=None, past=None):
+        """
+        The bounds of the first obstacle or bird the monkey runs into within
+        the horizon if it jumps after jump_after seconds, or None. With
+        jump_after None the monkey does not jump; otherwise it is followed
+        until it has landed beyond past, the bounds of the threat the jump is
+        meant to clear, since it can jump again from there. The monkey is
+        stepped the way the physics engine does, at a constant speed, landing
+        on the ground and on platforms, and in the air it is taken as
+        AUTOPILOT_MARGIN lower than it will be.
+        """
+        sim = self.sim
+        player = sim.player_sprite
+        left, right, bottom, top = hit_box_bounds(player)
+        jump_step = None if jump_after is None else round(jump_after / self.dt)
+        # A jump is followed for the horizon from when it is taken
+        steps = self.steps if jump_step is None else jump_step + self.steps
+        threats = self.threats(left, right, steps)
+        if not threats:
+            return None
+        floors = self.floors(left, right, steps)
+        points = adjusted_hit_box(player)
+        gravity = sim.physics_engine.gravity_constant
+        velocity = player.change_y
+        dy = 0.0
+        landed = False
+        for step in range(1, steps + 1):
+            dx = sim.player_speed * step * self.dt
+            if step - 1 == jump_step:
+                velocity = JUMP_SPEED
+            velocity -= gravity * self.dt
+            previous_dy, dy = dy, dy + velocity * self.dt
+            if velocity < 0:
+                # Land on the highest floor under the monkey that it sank through this step
+                for f_left, f_right, f_top in floors:
+                    if left + dx < f_right and right + dx > f_left and bottom + dy < f_top <= bottom + previous_dy:
+                        dy = f_top - bottom
+                        velocity = 0.0
+                        landed = jump_step is not None and step > jump_step
+            lift = dy
+            if dy > 0 and not landed:
+                lift = max(dy - AUTOPILOT_MARGIN, 0.0)
+            for (t_left, t_right, t_bottom, t_top), t_points in threats:
+                # Bounds first, then the hit boxes themselves the way the collision check sees them
+                if left + dx < t_right and right + dx > t_left and bottom + lift < t_top and top + lift > t_bottom:
+                    moved = [(x + dx, y + lift) for x, y in points]
+                    if polygons_intersecting(moved, [t_points])[0]:
+                        return t_left, t_right, t_bottom, t_top
+            if landed and left + dx >= past[1]:
+                return None
+        return None
+
+
+def play_game(sim, seed, max_seconds):
+    """
+    Play one game seeded seed on sim, with the autopilot, until it ends or
+    max_seconds of game time have passed. Returns the wall-clock time of
+    every step and how many times each GameEvent happened.
+    """
+    if sim.autopilot is None:
+        sim.autopilot = Autopilot(sim)
+    sim.reset(seed)
+    step_times = []
+    events = Counter()
+    while sim.game_state == GameStates.PLAYING and sim.elapsed_time < max_seconds:
+        start = time.perf_counter()
+        sim.step(SIMULATION_DT)
+        step_times.append(time.perf_counter() - start)
+        events.update(sim.events)
+    return step_times, events
+
+
+def soak(minutes, seed, max_game_minutes):
+    """
+    Play minutes of game time in games seeded seed, seed + 1 and so on,
+    each cut off after max_game_minutes. Returns each game's survival time
+    and score, the wall-clock time of every step and the total wall time.
+    """
+    sim = Simulation()
+    games = []
+    step_times = []
+    played = 0.0
+    start = time.perf_counter()
+    while played < minutes * 60:
+        game_step_times, events = play_game(sim, seed + len(games), min(max_game_minutes * 60, minutes * 60 - played))
+        step_times += game_step_times
+        played += sim.elapsed_time
+        games.append((sim.elapsed_time, sim.score, sim.game_state == GameStates.GAMEOVER))
+    return games, step_times, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60, help="game minutes to play in all")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game, counting up from there")
+    parser.add_argument("--max-game-minutes", type=float, default=10, help="cut off a game the autopilot survives this long")
+    parser.add_argument("--max-p99-ms", type=float, help="exit non-zero when the 99th percentile step time is over this")
+    args = parser.parse_args()
+
+    games, step_times, wall = soak(args.minutes, args.seed, args.max_game_minutes)
+    survival = [elapsed for elapsed, score, over in games]
+    played = sum(survival)
+    step_times.sort()
+    print(f"{len(games)} games, {played / 60:.1f} game minutes in {wall:.1f} wall s ({played / wall:.0f}x real time)")
+    print(
+        f"survival s: mean {statistics.mean(survival):.1f}  median {statistics.median(survival):.1f}"
+        f"  min {min(survival):.1f}  max {max(survival):.1f}"
+        f"  ({sum(not over for elapsed, score, over in games)} still playing when cut off)"
+    )
+    print(f"score: mean {statistics.mean(score for elapsed, score, over in games):.0f}  max {max(score for elapsed, score, over in games)}")
+    p99 = step_times[int(len(step_times) * 0.99)] * 1000
+    print(
+        f"step ms over {len(step_times)} steps: p50 {statistics.median(step_times) * 1000:.3f}"
+        f"  p99 {p99:.3f}  max {step_times[-1] * 1000:.3f}"
+    )
+
+    if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+        sys.exit(f"p99 step time {p99:.3f} ms is over --max-p99-ms {args.max_p99_ms}")
+
+
+if __name__ == "__main__":
+    main()
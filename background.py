@@ -0,0 +1,22 @@
+import arcade
+
+
+class BackgroundCompositor:
+    """
+    Renders the static background once into an offscreen framebuffer the size
+    of the window, then blits it to the screen each frame instead of
+    re-drawing and re-sampling the full-size background texture.
+    """
+
+    def __init__(self, window, texture):
+        self.ctx = window.ctx
+        width, height = window.get_framebuffer_size()
+        self.texture = self.ctx.texture((width, height), components=4)
+        self.framebuffer = self.ctx.framebuffer(color_attachments=[self.texture])
+
+        with self.framebuffer.activate():
+            self.framebuffer.clear()
+            arcade.draw_lrwh_rectangle_textured(0, 0, window.width, window.height, texture)
+
+    def draw(self):
+        self.ctx.copy_framebuffer(self.framebuffer, self.ctx.screen)
@@ -0,0 +1,129 @@
+"""
+Plays many seeded games with the autopilot across every core and reports
+them together: score, survival time, bananas collected and step-time
+percentiles per game, summed up over the batch. --spacing overrides the
+world generator's gap range for one kind of entity, to compare spawn
+tuning over the same seeds. Step times only compare between runs with
+the same --jobs, and no more jobs than idle cores.
+
+    python batch.py --sessions 200 --seed 1 --spacing obstacle=250,350
+"""
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from autopilot import play_game
+from bundle import AssetBundle
+from simulation import GameEvents, GameStates, Simulation
+from worldgen import SPACING, Entities
+
+BANANA_EVENTS = (GameEvents.BANANA_COLLECTED, GameEvents.SPECIAL_BANANA_COLLECTED, GameEvents.SHIELD_BANANA_COLLECTED)
+
+# Each worker process builds one Simulation and plays all of its sessions on it
+_sim = None
+
+
+def init_worker(bundle_path, spacing):
+    # The parent has already built the bundle, so every worker only maps it
+    global _sim
+    _sim = Simulation(assets=AssetBundle(bundle_path), spacing=spacing)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def play_session(seed, max_seconds):
+    """
+    Play one game in a worker process and boil it down to a record of plain
+    numbers, so only that crosses back to the parent.
+    """
+    step_times, events = play_game(_sim, seed, max_seconds)
+    step_times.sort()
+    return {
+        "seed": seed,
+        "score": _sim.score,
+        "survival_s": round(_sim.elapsed_time, 3),
+        "game_over": _sim.game_state == GameStates.GAMEOVER,
+        "bananas": sum(events[event] for event in BANANA_EVENTS),
+        "hits": events[GameEvents.OBSTACLE_HIT],
+        "steps": len(step_times),
+        "step_p50_ms": percentile(step_times, 0.5) * 1000,
+        "step_p99_ms": percentile(step_times, 0.99) * 1000,
+        "step_max_ms": step_times[-1] * 1000,
+        "wall_s": sum(step_times),
+    }
+
+
+def run_batch(seeds, max_seconds, spacing=SPACING, jobs=None):
+    # Build the bundle here if it is out of date, rather than in every worker at once
+    bundle_path = AssetBundle.load_or_build().path
+    # Records come back in seed order, whichever process finished first
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(bundle_path, spacing)) as executor:
+        return list(executor.map(play_session, seeds, [max_seconds] * len(seeds)))
+
+
+def parse_spacing(overrides):
+    # ["obstacle=250,350", ...] on top of the game's SPACING
+    spacing = dict(SPACING)
+    for override in overrides:
+        name, _, gap = override.partition("=")
+        low, high = (int(value) for value in gap.split(","))
+        spacing[Entities[name.upper()]] = (low, high)
+    return spacing
+
+
+def summary(records, key):
+    values = [record[key] for record in records]
+    return (
+        f"mean {statistics.mean(values):9.2f}  median {statistics.median(values):9.2f}"
+        f"  min {min(values):9.2f}  max {max(values):9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first session, counting up from there")
+    parser.add_argument("--max-game-minutes", type=float, default=5, help="cut off a game the autopilot survives this long")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument(
+        "--spacing", action="append", default=[], metavar="ENTITY=MIN,MAX",
+        help="gap range for obstacle, bird, banana or platform; repeat for more than one",
+    )
+    parser.add_argument("--json", type=pathlib.Path, help="also write every session's record here, one per line")
+    args = parser.parse_args()
+
+    if args.max_game_minutes <= 0:
+        parser.error("--max-game-minutes must be more than 0")
+    if args.sessions <= 0:
+        parser.error("--sessions must be more than 0")
+    spacing = parse_spacing(args.spacing)
+    seeds = list(range(args.seed, args.seed + args.sessions))
+    start = time.perf_counter()
+    records = run_batch(seeds, args.max_game_minutes * 60, spacing, args.jobs)
+    wall = time.perf_counter() - start
+
+    played = sum(record["survival_s"] for record in records)
+    stepping = sum(record["wall_s"] for record in records)
+    print(
+        f"{len(records)} sessions, {played / 60:.1f} game minutes in {wall:.1f} wall s"
+        f" on {args.jobs} worker processes, {stepping / wall:.1f} of them stepping on average"
+    )
+    print("spacing: " + "  ".join(f"{entity.name.lower()} {low}-{high}" for entity, (low, high) in spacing.items()))
+    print(f"{sum(not record['game_over'] for record in records)} still playing when cut off")
+    for key in ("score", "survival_s", "bananas", "hits", "step_p50_ms", "step_p99_ms", "step_max_ms"):
+        print(f"{key:>12}  {summary(records, key)}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
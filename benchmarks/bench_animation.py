@@ -0,0 +1,119 @@
+"""
+Bird animation cost per frame and flap rate at several frame rates, for a
+frame counter on every bird versus one delta_time phase clock swapping the
+keyframe of a whole KeyframeSpriteList. The counters flap faster the higher
+the frame rate and cost more the more birds there are; the clock keeps the
+same rate at any frame rate and the same cost at any bird count. A hidden
+window is opened so the sprite lists write real texture buffers.
+
+    python benchmarks/bench_animation.py --birds 10 100 1000 10000 --seconds 10
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pyglet
+
+FRAME_RATES = (30, 60, 144)
+
+
+def make_birds(sprite_list, count, texture):
+    import arcade
+
+    for i in range(count):
+        bird = arcade.Sprite(texture=texture)
+        bird.left = i * 100
+        bird.bottom = 300
+        bird.bird_frame_count = 0
+        bird.bird_frame = 0
+        sprite_list.append(bird)
+    return sprite_list
+
+
+def frame_counters(count, registry):
+    # Every bird counts frames and swaps its own texture
+    import arcade
+
+    from constants import BIRD_CELL_SIZE
+    from textures import BIRD_FLYING_TEXTURES
+
+    bird_flying = [registry[key] for key in BIRD_FLYING_TEXTURES]
+    birds = make_birds(
+        arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=BIRD_CELL_SIZE), count, bird_flying[0]
+    )
+
+    def animate(delta_time):
+        for bird in birds:
+            bird.bird_frame_count += 1
+            if bird.bird_frame_count >= 10:
+                bird.bird_frame_count = 0
+                bird.bird_frame = (bird.bird_frame + 1) % len(bird_flying)
+                bird.texture = bird_flying[bird.bird_frame]
+
+    return animate, lambda: birds[0].texture
+
+
+def phase_clock(count, registry):
+    # One clock swaps the keyframe for the whole list
+    from animation import KeyframeSpriteList, PhaseClock, animate_list
+    from constants import ANIMATION_FRAME_TIME, BIRD_CELL_SIZE
+    from textures import BIRD_FLYING_TEXTURES, uniform_keyframes
+
+    bird_flying = uniform_keyframes([registry[key] for key in BIRD_FLYING_TEXTURES])
+    birds = make_birds(
+        KeyframeSpriteList(use_spatial_hash=True, spatial_hash_cell_size=BIRD_CELL_SIZE), count, bird_flying[0]
+    )
+    clock = PhaseClock(ANIMATION_FRAME_TIME, len(bird_flying))
+    return lambda delta_time: animate_list(birds, clock, bird_flying, delta_time), lambda: birds.keyframe
+
+
+def run(animation, registry, count, seconds, fps):
+    # Per-frame cost, and how often the first bird changed texture per second
+    animate, shown = animation(count, registry)
+    frames = round(seconds * fps)
+    flaps = 0
+    elapsed = 0.0
+    for _ in range(frames):
+        texture = shown()
+        start = time.perf_counter()
+        animate(1 / fps)
+        elapsed += time.perf_counter() - start
+        flaps += shown() is not texture
+    return elapsed / frames, flaps / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--birds", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=10, help="simulated seconds per run")
+    parser.add_argument("--headless", action="store_true", help="open the window offscreen through EGL, with no display")
+    args = parser.parse_args()
+
+    if args.headless:
+        pyglet.options["headless"] = True
+
+    import arcade
+
+    from textures import load_texture_registry
+
+    # Sprite lists made while a window is open set up their GPU buffers straight away
+    window = arcade.Window(64, 64, "bench_animation", visible=False)
+    registry = load_texture_registry()
+    print("ms per frame, and flaps per second")
+    print(f"{'birds':>6}  {'fps':>4}  {'counters ms':>11}  {'flaps/s':>7}  {'clock ms':>8}  {'flaps/s':>7}")
+    for count in args.birds:
+        for fps in FRAME_RATES:
+            counters_ms, counters_rate = run(frame_counters, registry, count, args.seconds, fps)
+            clock_ms, clock_rate = run(phase_clock, registry, count, args.seconds, fps)
+            print(
+                f"{count:6}  {fps:4}  {counters_ms * 1000:11.4f}  {counters_rate:7.1f}"
+                f"  {clock_ms * 1000:8.4f}  {clock_rate:7.1f}"
+            )
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
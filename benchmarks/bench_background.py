@@ -0,0 +1,70 @@
+"""
+Cost per frame of drawing the background and cloud layer, re-drawing the
+full-size background texture every frame versus blitting the copy that
+BackgroundCompositor rendered once. Run it on the software rasterizer to
+see fill-rate savings:
+
+    LIBGL_ALWAYS_SOFTWARE=1 python benchmarks/bench_background.py --headless
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pyglet
+
+
+def time_frames(window, frames, draw_background, clouds_list):
+    window.ctx.finish()
+    start = time.perf_counter()
+    for _ in range(frames):
+        window.clear()
+        draw_background()
+        clouds_list.draw()
+    # Wait for the GPU, so the time covers the fill work and not just the submission
+    window.ctx.finish()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--headless", action="store_true", help="render offscreen through EGL, with no display")
+    args = parser.parse_args()
+
+    if args.headless:
+        pyglet.options["headless"] = True
+
+    import arcade
+
+    from background import BackgroundCompositor
+    from constants import ASSETS_PATH, MAX_CLOUDS, SCREEN_HEIGHT, SCREEN_WIDTH
+
+    window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, "bench_background")
+    background = arcade.load_texture(ASSETS_PATH / "jungle-background.png")
+    clouds_list = arcade.SpriteList()
+    for i in range(MAX_CLOUDS):
+        cloud = arcade.Sprite(ASSETS_PATH / "cloud.png")
+        cloud.left = i * SCREEN_WIDTH // MAX_CLOUDS
+        cloud.top = 340
+        clouds_list.append(cloud)
+
+    compositor = BackgroundCompositor(window, background)
+    before = time_frames(
+        window,
+        args.frames,
+        lambda: arcade.draw_lrwh_rectangle_textured(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, background),
+        clouds_list,
+    )
+    after = time_frames(window, args.frames, compositor.draw, clouds_list)
+
+    print(f"renderer: {window.ctx.info.RENDERER}")
+    print(f"draw_lrwh_rectangle_textured: {before * 1000:7.3f} ms/frame")
+    print(f"background compositor blit:   {after * 1000:7.3f} ms/frame")
+    print(f"speedup:                      {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Collision cost per frame of the monkey against one sprite list, for a
+per-sprite collides_with_sprite loop, a brute-force check_for_collision_with_list
+and spatially hashed lists with several cell sizes.
+
+    python benchmarks/bench_collision.py --sizes 10 100 1000 10000
+"""
+import argparse
+import pathlib
+import sys
+import time
+from random import Random
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import arcade
+
+from textures import TextureKeys, load_texture_registry
+
+SPACING = 250
+CELL_SIZES = (64, 128, 256, 512)
+
+
+def make_list(registry, count, **kwargs):
+    rng = Random(count)
+    sprite_list = arcade.SpriteList(**kwargs)
+    for i in range(count):
+        sprite = arcade.Sprite(texture=registry[TextureKeys.BANANA])
+        sprite.left = i * SPACING
+        sprite.bottom = rng.choice((30, 230, 330))
+        sprite_list.append(sprite)
+    return sprite_list
+
+
+def time_frames(player, frames, width, check):
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Sweep the monkey across the populated range, one position per frame
+        player.center_x = (frame * 37) % width
+        check()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    registry = load_texture_registry()
+    player = arcade.Sprite(texture=registry[TextureKeys.MONKEY])
+    player.center_y = 100
+
+    header = f"{'sprites':>8}  {'per-sprite':>10}  {'brute':>8}" + "".join(f"  {f'hash {size}':>9}" for size in CELL_SIZES)
+    print("ms per frame")
+    print(header)
+    for count in args.sizes:
+        width = count * SPACING
+        plain = make_list(registry, count)
+        results = [
+            time_frames(player, args.frames, width, lambda: [s for s in plain if player.collides_with_sprite(s)]),
+            time_frames(player, args.frames, width, lambda: arcade.check_for_collision_with_list(player, plain, method=3)),
+        ]
+        for size in CELL_SIZES:
+            hashed = make_list(registry, count, use_spatial_hash=True, spatial_hash_cell_size=size)
+            results.append(time_frames(player, args.frames, width, lambda: player.collides_with_list(hashed)))
+        print(f"{count:8}" + "".join(f"  {result * 1000:{width_}.4f}" for result, width_ in zip(results, (10, 8) + (9,) * len(CELL_SIZES))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Simulated game seconds per wall-clock second for the headless Simulation,
+restarting whenever the monkey runs out of health.
+
+    python benchmarks/bench_headless.py --seconds 600
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from constants import SIMULATION_DT
+from simulation import GameStates, Simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=600, help="simulated seconds to run")
+    parser.add_argument("--dt", type=float, default=SIMULATION_DT)
+    args = parser.parse_args()
+
+    sim = Simulation()
+    sim.reset()
+    simulated = 0.0
+    games = 1
+    start = time.perf_counter()
+    while simulated < args.seconds:
+        simulated += sim.run(args.seconds - simulated, args.dt) * args.dt
+        if sim.game_state == GameStates.GAMEOVER:
+            sim.reset()
+            games += 1
+    wall = time.perf_counter() - start
+
+    print(f"simulated: {simulated:.0f} s over {games} games, wall: {wall:.2f} s")
+    print(f"speed:     {simulated / wall:.0f} simulated s per wall s")
+    for name, stats in sim.pool_stats().items():
+        print(f"pool {name:10} hits: {stats['hits']:6}  misses: {stats['misses']:6}  free: {stats['free']:4}")
+
+
+if __name__ == "__main__":
+    main()
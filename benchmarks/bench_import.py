@@ -0,0 +1,89 @@
+"""
+Import time of main.py from `python -X importtime`, in a fresh process
+per run: main's own time, which used to include decoding every sound, its
+total with everything it imports, and the slowest modules. Also times
+decoding the sounds, which now happens on a background thread after the
+window opens. --max-main-ms fails the run when main's own time is over
+budget.
+
+    python benchmarks/bench_import.py --headless --runs 5 --max-main-ms 8
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+IMPORT_MAIN = """
+import pyglet
+pyglet.options["headless"] = {headless}
+import main
+"""
+
+DECODE_SOUNDS = """
+import json, time
+import pyglet
+pyglet.options["headless"] = {headless}
+import main
+start = time.perf_counter()
+for sound in main.EVENT_SOUNDS.values():
+    sound.load()
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def import_times(headless):
+    # {module: (self us, cumulative us)} from one fresh interpreter
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_MAIN.format(headless=headless)],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def decode_time(headless):
+    result = subprocess.run(
+        [sys.executable, "-c", DECODE_SOUNDS.format(headless=headless)],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list, by their own time")
+    parser.add_argument("--max-main-ms", type=float, help="exit non-zero when main's own import time is over this")
+    parser.add_argument("--headless", action="store_true", help="import pyglet with no display")
+    args = parser.parse_args()
+
+    runs = [import_times(args.headless) for _ in range(args.runs)]
+    main_self = statistics.median(run["main"][0] for run in runs) / 1000
+    main_total = statistics.median(run["main"][1] for run in runs) / 1000
+    decode = statistics.median(decode_time(args.headless) for _ in range(args.runs)) * 1000
+
+    print(f"ms, median of {args.runs} fresh processes")
+    print(f"main, own time:          {main_self:8.2f}")
+    print(f"main, with its imports:  {main_total:8.2f}")
+    print(f"sound decoding, off the import path: {decode:8.2f}")
+    print()
+    print(f"slowest {args.top} modules by own time")
+    slowest = sorted(runs[0], key=lambda name: statistics.median(run[name][0] for run in runs if name in run))
+    for name in reversed(slowest[-args.top:]):
+        print(f"  {statistics.median(run[name][0] for run in runs if name in run) / 1000:8.2f}  {name}")
+
+    if args.max_main_ms is not None and main_self > args.max_main_ms:
+        sys.exit(f"main's own import time {main_self:.2f} ms is over --max-main-ms {args.max_main_ms}")
+
+
+if __name__ == "__main__":
+    main()
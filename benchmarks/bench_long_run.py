@@ -0,0 +1,57 @@
+"""
+Entity list sizes and step time over a long headless run, with and without
+despawning entities that fall behind the camera. The monkey is given
+effectively unlimited health so a single game lasts the whole run.
+
+    python benchmarks/bench_long_run.py --minutes 20
+"""
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from constants import DESPAWN_DISTANCE, SIMULATION_DT
+from simulation import Simulation
+
+
+def run(minutes, despawn_distance):
+    sim = Simulation(despawn_distance=despawn_distance)
+    sim.reset()
+    sim.health = 10 ** 9
+    steps_per_minute = round(60 / SIMULATION_DT)
+
+    print(f"despawn distance: {despawn_distance}")
+    print("minute  obstacles  birds  bananas  platforms  mean ms  p99 ms")
+    for minute in range(1, minutes + 1):
+        times = []
+        for _ in range(steps_per_minute):
+            start = time.perf_counter()
+            sim.step(SIMULATION_DT)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(
+            f"{minute:6}  {len(sim.obstacles_list):9}  {len(sim.birds_list):5}  "
+            f"{len(sim.bananas_list) + len(sim.special_bananas_list) + len(sim.shield_bananas_list):7}  "
+            f"{len(sim.floating_platform_list):9}  {statistics.mean(times) * 1000:7.3f}  "
+            f"{times[int(len(times) * 0.99)] * 1000:6.3f}"
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=20, help="simulated minutes per run")
+    parser.add_argument("--despawn-distance", type=int, default=DESPAWN_DISTANCE)
+    parser.add_argument("--skip-baseline", action="store_true", help="only run with despawning enabled")
+    args = parser.parse_args()
+
+    if not args.skip_baseline:
+        run(args.minutes, None)
+    run(args.minutes, args.despawn_distance)
+
+
+if __name__ == "__main__":
+    main()
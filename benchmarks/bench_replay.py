@@ -0,0 +1,67 @@
+"""
+Step-time distribution over identical replays of one session. Without
+--session it records a 10 minute game first: a fixed seed, jumps at seeded
+random moments and unlimited health, so every run replays the same frames.
+
+    python benchmarks/bench_replay.py --minutes 10 --runs 3
+"""
+import argparse
+import pathlib
+import random
+import statistics
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from constants import SIMULATION_DT
+from replay import SessionRecorder, load_session, replay
+from simulation import Actions, Simulation
+
+
+def record_session(sim, minutes, seed):
+    sim.reset(seed)
+    sim.recorder = SessionRecorder(seed, overrides={"health": 10 ** 9})
+    sim.health = 10 ** 9
+    inputs = random.Random(seed)
+    release_at = None
+    for frame in range(round(minutes * 60 / SIMULATION_DT)):
+        if release_at == frame:
+            sim.release(Actions.JUMP)
+            release_at = None
+        elif release_at is None and inputs.random() < 0.02:
+            sim.press(Actions.JUMP)
+            release_at = frame + inputs.randint(5, 40)
+        sim.step(SIMULATION_DT)
+    sim.recorder, recorder = None, sim.recorder
+    return recorder.session()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--session", type=pathlib.Path, help="a session saved by the game or replay.SessionRecorder")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    sim = Simulation()
+    session = load_session(args.session) if args.session else record_session(sim, args.minutes, args.seed)
+    print(f"session: seed {session['seed']}, {len(session['delta_times'])} steps, {len(session['inputs'])} inputs")
+
+    print(f"{'run':>3}  {'score':>6}  {'p50 ms':>7}  {'p90 ms':>7}  {'p99 ms':>7}  {'max ms':>7}  {'total s':>7}")
+    outcomes = set()
+    for run in range(1, args.runs + 1):
+        sim, step_times = replay(session, Simulation(assets=sim.assets))
+        outcomes.add((sim.score, sim.health, sim.frame, round(sim.player_sprite.center_x, 6)))
+        total = sum(step_times)
+        step_times.sort()
+        print(
+            f"{run:3}  {sim.score:6}  {statistics.median(step_times) * 1000:7.3f}  "
+            f"{step_times[int(len(step_times) * 0.9)] * 1000:7.3f}  {step_times[int(len(step_times) * 0.99)] * 1000:7.3f}  "
+            f"{step_times[-1] * 1000:7.3f}  {total:7.2f}"
+        )
+    print("every run reached the same state" if len(outcomes) == 1 else f"runs diverged: {outcomes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Restart latency and resident memory over consecutive restarts, for reset()
+on the window's existing scene, sprites and GPU buffers versus rebuilding a
+fresh Simulation and Scene each time. Each game is played and drawn for a
+few frames before it restarts.
+
+    python benchmarks/bench_restart.py --headless --restarts 100
+"""
+import argparse
+import gc
+import os
+import pathlib
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pyglet
+
+
+def resident_mb():
+    # Current RSS from /proc where there is one, else the peak from getrusage
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sprite_list_count(arcade):
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, arcade.SpriteList))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--restarts", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=30, help="frames played before each restart")
+    parser.add_argument("--headless", action="store_true", help="render offscreen through EGL, with no display")
+    args = parser.parse_args()
+
+    if args.headless:
+        pyglet.options["headless"] = True
+
+    import arcade
+
+    from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+    from main import JungleDash
+    from simulation import Simulation
+
+    window = JungleDash(SCREEN_WIDTH, SCREEN_HEIGHT, "bench_restart")
+    window.setup()
+
+    def rebuild():
+        window.sim = Simulation(assets=window.assets)
+        window.setup()
+
+    print(f"{'restart':>8}  {'median ms':>9}  {'p95 ms':>7}  {'max ms':>7}  {'RSS start':>9}  {'RSS end':>8}  {'SpriteLists':>11}")
+    for name, restart in (("reset", window.reset), ("rebuild", rebuild)):
+        gc.collect()
+        rss_start = resident_mb()
+        times = []
+        for _ in range(args.restarts):
+            for _ in range(args.frames):
+                window.on_update(1 / 60)
+                window.on_draw()
+            window.ctx.finish()
+            start = time.perf_counter()
+            restart()
+            times.append(time.perf_counter() - start)
+        gc.collect()
+        times.sort()
+        print(
+            f"{name:>8}  {statistics.median(times) * 1000:9.2f}  {times[int(len(times) * 0.95) - 1] * 1000:7.2f}"
+            f"  {times[-1] * 1000:7.2f}  {rss_start:8.1f}M  {resident_mb():7.1f}M  {sprite_list_count(arcade):11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Separating-axis test cost of one hit box against N candidates, for arcade's
+pure-Python are_polygons_intersecting in a loop versus the NumPy batch in
+collision.py, with 8-, 16- and 64-vertex hit boxes.
+
+    python benchmarks/bench_sat.py --vertices 8 16 64 --candidates 1 4 16 64 256
+"""
+import argparse
+import math
+import pathlib
+import sys
+import time
+from random import Random
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import collision
+
+
+def make_polygon(rng, vertices, radius=40.0, spread=40.0):
+    # A convex, roughly round hit box near the origin. Most candidates overlap
+    # the first, as ones that pass the radius check usually do, so every axis is tested
+    x, y = rng.uniform(-spread, spread), rng.uniform(-spread, spread)
+    return [
+        (x + radius * math.cos(2 * math.pi * i / vertices), y + radius * math.sin(2 * math.pi * i / vertices))
+        for i in range(vertices)
+    ]
+
+
+def time_calls(budget, test, polygon, candidates):
+    # Repeat until the time budget is spent, so large cases don't run for minutes
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        test(polygon, candidates)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vertices", type=int, nargs="+", default=[8, 16, 64])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--budget", type=float, default=0.25, help="seconds spent timing each case")
+    args = parser.parse_args()
+
+    if collision.numpy is None:
+        print("NumPy is not installed, only the pure-Python loop is timed")
+
+    print("us per call")
+    print(f"{'vertices':>8}  {'candidates':>10}  {'python':>10}  {'numpy':>10}  {'speedup':>7}")
+    for vertices in args.vertices:
+        for count in args.candidates:
+            rng = Random(vertices * 1000 + count)
+            polygon = make_polygon(rng, vertices)
+            candidates = [make_polygon(rng, vertices) for _ in range(count)]
+
+            python_time = time_calls(args.budget, collision.polygons_intersecting_python, polygon, candidates)
+            row = f"{vertices:8}  {count:10}  {python_time * 1e6:10.1f}"
+            if collision.numpy is not None:
+                expected = collision.polygons_intersecting_python(polygon, candidates)
+                if collision.polygons_intersecting_numpy(polygon, candidates) != expected:
+                    raise SystemExit(f"NumPy result differs for {vertices} vertices, {count} candidates")
+                numpy_time = time_calls(args.budget, collision.polygons_intersecting_numpy, polygon, candidates)
+                row += f"  {numpy_time * 1e6:10.1f}  {python_time / numpy_time:6.1f}x"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
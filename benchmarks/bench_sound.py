@@ -0,0 +1,93 @@
+"""
+Sound cost per frame and players allocated per minute over a scripted
+banana streak, for arcade.play_sound on every cue versus the SoundMixer's
+pooled voices. Every few frames a burst of identical cues lands on the
+same frame, the way one collision check can collect several bananas.
+
+    python benchmarks/bench_sound.py --headless --seconds 30 --burst 5
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import pyglet
+
+FPS = 60
+
+
+def streak(frames, burst):
+    # A burst of banana cues every tenth of a second and a hit every second
+    from simulation import GameEvents
+
+    for frame in range(frames):
+        cues = []
+        if frame % 6 == 0:
+            cues += [GameEvents.BANANA_COLLECTED] * burst
+        if frame % 60 == 30:
+            cues.append(GameEvents.OBSTACLE_HIT)
+        yield cues
+
+
+def pump():
+    # Let players see their end of stream, as the window's event loop would
+    pyglet.clock.tick()
+    pyglet.app.platform_event_loop.dispatch_posted_events()
+
+
+def run(play, frames, burst):
+    elapsed = 0.0
+    for cues in streak(frames, burst):
+        start = time.perf_counter()
+        play(cues)
+        elapsed += time.perf_counter() - start
+        pump()
+        time.sleep(1 / FPS)
+    return elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--burst", type=int, default=5, help="identical cues landing on one frame")
+    parser.add_argument("--headless", action="store_true", help="load the audio driver with no display")
+    args = parser.parse_args()
+
+    if args.headless:
+        pyglet.options["headless"] = True
+
+    import arcade
+
+    from main import EVENT_SOUNDS
+    from mixer import SoundMixer
+
+    frames = round(args.seconds * FPS)
+    minutes = args.seconds / 60
+    print(f"audio driver: {type(pyglet.media.get_audio_driver()).__name__}")
+    print(f"{'':>12}  {'ms/frame':>8}  {'cues played':>11}  {'players/min':>11}")
+
+    allocations = 0
+    sounds = {key: arcade.Sound(handle.file_name) for key, handle in EVENT_SOUNDS.items()}
+
+    def play_each(cues):
+        nonlocal allocations
+        for cue in cues:
+            arcade.play_sound(sounds[cue], 1.0, -1, False)
+            allocations += 1
+
+    per_frame = run(play_each, frames, args.burst)
+    print(f"{'play_sound':>12}  {per_frame * 1000:8.3f}  {allocations:11}  {allocations / minutes:11.1f}")
+
+    mixer = SoundMixer(EVENT_SOUNDS, pan=-1.0)
+    mixer.load_all()
+    per_frame = run(mixer.play_frame, frames, args.burst)
+    stats = mixer.stats()
+    print(f"{'mixer':>12}  {per_frame * 1000:8.3f}  {stats['plays']:11}  {stats['allocations'] / minutes:11.1f}")
+    print(f"mixer: {stats['allocations']} players built in all, {stats['steals']} stolen, "
+          f"{stats['duplicates']} same-frame duplicates dropped")
+
+
+if __name__ == "__main__":
+    main()
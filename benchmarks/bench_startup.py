@@ -0,0 +1,98 @@
+"""
+Cold start (process launch to the first game being set up) and restart
+(reset() after a game over) times, loading images from the PNGs with
+a hit box scan each, from the PNGs with persisted hit boxes, and from the
+memory-mapped asset bundle. Each cold start runs in a fresh process.
+
+    python benchmarks/bench_startup.py --headless --launches 5 --restarts 20
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ("png", "hit-box-cache", "bundle")
+
+
+def child(mode, restarts, headless):
+    # Runs in its own process, so nothing is cached in memory yet
+    import pyglet
+
+    if headless:
+        pyglet.options["headless"] = True
+
+    from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    if mode == "png":
+        from hitboxes import HitBoxStore
+
+        # A store that was never saved scans every hit box, like plain arcade.load_texture
+        assets = HitBoxStore(pathlib.Path(tempfile.mkdtemp()) / "hit-boxes.json")
+    elif mode == "hit-box-cache":
+        from hitboxes import HitBoxStore
+
+        assets = HitBoxStore()
+    else:
+        from bundle import AssetBundle
+
+        assets = AssetBundle()
+
+    from main import JungleDash
+
+    window = JungleDash(SCREEN_WIDTH, SCREEN_HEIGHT, "bench_startup", assets=assets)
+    window.setup()
+    window.on_draw()
+    window.ctx.finish()
+    cold_start = time.perf_counter() - START
+
+    restart_times = []
+    for _ in range(restarts):
+        start = time.perf_counter()
+        window.reset()
+        restart_times.append(time.perf_counter() - start)
+    print(json.dumps({"cold_start": cold_start, "restart": statistics.median(restart_times)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--launches", type=int, default=5)
+    parser.add_argument("--restarts", type=int, default=20)
+    parser.add_argument("--headless", action="store_true", help="render offscreen through EGL, with no display")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.restarts, args.headless)
+        return
+
+    # Warm the persisted caches once, so only the "png" mode pays for scans
+    from bundle import AssetBundle
+
+    AssetBundle.load_or_build()
+
+    print("ms, median over launches")
+    print(f"{'source':>14}  {'cold start':>10}  {'restart':>8}")
+    for mode in MODES:
+        command = [sys.executable, __file__, "--child", mode, "--restarts", str(args.restarts)]
+        if args.headless:
+            command.append("--headless")
+        results = [
+            json.loads(subprocess.run(command, check=True, capture_output=True, text=True, cwd=ROOT).stdout.splitlines()[-1])
+            for _ in range(args.launches)
+        ]
+        cold_start = statistics.median(result["cold_start"] for result in results)
+        restart = statistics.median(result["restart"] for result in results)
+        print(f"{mode:>14}  {cold_start * 1000:10.1f}  {restart * 1000:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-frame cost of the monkey and bird animation path in JungleDash.on_update,
+loading textures by path every swap (before) versus swapping references out of
+the preloaded texture registry (after).
+
+    python benchmarks/bench_textures.py --birds 1000 --frames 600
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import arcade
+
+from constants import ASSETS_PATH
+from textures import BIRD_FLYING_TEXTURES, MONKEY_VARIANT_TEXTURES, MonkeyVariants, load_texture_registry
+
+
+def make_birds(count, texture):
+    birds = arcade.SpriteList()
+    for i in range(count):
+        bird = arcade.Sprite(texture=texture)
+        bird.left = i * 100
+        bird.bird_frame_count = i % 10
+        bird.bird_frame = 0
+        birds.append(bird)
+    return birds
+
+
+def animate(player, player_running, player_jumping, birds, bird_flying, frames, load):
+    monkey_frame_count = 0
+    monkey_frame = 0
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Alternate half a second of running with half a second of jumping
+        if (frame // 30) % 2:
+            player.texture = load(player_jumping)
+        else:
+            monkey_frame_count += 1
+            if monkey_frame_count >= 10:
+                monkey_frame_count = 0
+                monkey_frame = (monkey_frame + 1) % len(player_running)
+                player.texture = load(player_running[monkey_frame])
+
+        for bird in birds:
+            bird.bird_frame_count += 1
+            if bird.bird_frame_count >= 10:
+                bird.bird_frame_count = 0
+                bird.bird_frame = (bird.bird_frame + 1) % len(bird_flying)
+                bird.texture = load(bird_flying[bird.bird_frame])
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--birds", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    registry = load_texture_registry()
+    running, jumping, _ = MONKEY_VARIANT_TEXTURES[MonkeyVariants.NORMAL]
+
+    # Before: paths, resolved through arcade.load_texture on every swap
+    player = arcade.Sprite(ASSETS_PATH / "monkey.png")
+    birds = make_birds(args.birds, registry[BIRD_FLYING_TEXTURES[0]])
+    before = animate(
+        player,
+        [ASSETS_PATH / "monkey.png", ASSETS_PATH / "monkey2.png"],
+        ASSETS_PATH / "monkey-jumping.png",
+        birds,
+        [ASSETS_PATH / "bird.png", ASSETS_PATH / "bird2.png"],
+        args.frames,
+        arcade.load_texture,
+    )
+
+    # After: textures straight out of the registry
+    player = arcade.Sprite(texture=registry[running[0]])
+    birds = make_birds(args.birds, registry[BIRD_FLYING_TEXTURES[0]])
+    after = animate(
+        player,
+        [registry[key] for key in running],
+        registry[jumping],
+        birds,
+        [registry[key] for key in BIRD_FLYING_TEXTURES],
+        args.frames,
+        lambda texture: texture,
+    )
+
+    print(f"birds: {args.birds}, frames: {args.frames}")
+    print(f"load_texture per swap: {before * 1000:8.3f} ms/frame")
+    print(f"texture registry:      {after * 1000:8.3f} ms/frame")
+    print(f"speedup:               {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
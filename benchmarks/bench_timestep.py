@@ -0,0 +1,85 @@
+"""
+Game speed and height reached across frame rates, stepping the simulation
+once per frame with that frame's delta_time versus the fixed-timestep
+driver, and the update cost per frame of each. "jittery" alternates fast
+frames with a 50 ms stall about every half second.
+
+    python benchmarks/bench_timestep.py --seconds 20
+"""
+import argparse
+import itertools
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from simulation import Actions, Simulation
+from timestep import FixedTimestep
+
+FRAME_RATES = {
+    "30 FPS": [1 / 30],
+    "60 FPS": [1 / 60],
+    "144 FPS": [1 / 144],
+    "jittery": [1 / 144] * 71 + [0.05],
+}
+
+
+def per_frame(sim):
+    return sim.step
+
+
+def fixed(sim):
+    timestep = FixedTimestep(sim)
+    timestep.reset()
+    return timestep.advance
+
+
+def run(driver, frame_times, seconds, seed):
+    """
+    Play seconds of one seeded game with unlimited health, jumping once a
+    second. Returns the distance run, the highest the monkey got above the
+    ground and the update time per frame.
+    """
+    sim = Simulation()
+    sim.reset(seed)
+    sim.health = 10 ** 9
+    advance = driver(sim)
+    start_x = sim.player_sprite.center_x
+    ground = sim.player_sprite.bottom
+    highest = 0.0
+    played = 0.0
+    frames = 0
+    elapsed = 0.0
+    next_jump = 1.0
+    for delta_time in itertools.cycle(frame_times):
+        if played >= seconds:
+            break
+        if played >= next_jump:
+            sim.press(Actions.JUMP)
+            sim.release(Actions.JUMP)
+            next_jump += 1.0
+        begin = time.perf_counter()
+        advance(delta_time)
+        elapsed += time.perf_counter() - begin
+        highest = max(highest, sim.player_sprite.bottom - ground)
+        played += delta_time
+        frames += 1
+    return sim.player_sprite.center_x - start_x, highest, elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20, help="game seconds per run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'':>8}  {'driver':>10}  {'distance px':>11}  {'highest point':>13}  {'ms/frame':>8}")
+    for name, frame_times in FRAME_RATES.items():
+        for label, driver in (("per frame", per_frame), ("fixed", fixed)):
+            distance, highest, cost = run(driver, frame_times, args.seconds, args.seed)
+            print(f"{name:>8}  {label:>10}  {distance:11.1f}  {highest:13.1f}  {cost * 1000:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
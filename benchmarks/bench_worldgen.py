@@ -0,0 +1,101 @@
+"""
+World generation cost per chunk at the game's spacing and at denser
+settings, down to entities packed edge to edge, for the per-lane interval
+index versus scanning a list of placed hit boxes and stepping a fixed
+distance until nothing overlaps. Wider chunks hold more entities to check
+each placement against.
+
+    python benchmarks/bench_worldgen.py --chunks 100 --chunk-widths 1 4 16
+"""
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from constants import SCREEN_WIDTH
+from simulation import Simulation
+from worldgen import SPACING, ChunkedWorldGenerator
+
+# Fraction of the game's random gap between entities
+DENSITIES = {"game": 1.0, "dense": 0.25, "denser": 0.05, "packed": 0.0}
+
+
+class RetryScanIndex:
+    """Placed x-ranges in a plain list, resolved by stepping and rescanning."""
+
+    def __init__(self, step_right=50, step_left=175):
+        self.boxes = []
+        self.step_right = step_right
+        self.step_left = step_left
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def add(self, left, right):
+        self.boxes.append((left, right))
+
+    def overlaps(self, left, right):
+        return any(left < other_right and right > other_left for other_left, other_right in self.boxes)
+
+    def fit_right(self, left, width):
+        while self.overlaps(left, left + width):
+            left += self.step_right
+        return left
+
+    def fit_left(self, left, width):
+        while self.overlaps(left, left + width):
+            left -= self.step_left
+        return left
+
+    def discard_before(self, x):
+        self.boxes = [box for box in self.boxes if box[1] > x]
+
+
+class RetryScanGenerator(ChunkedWorldGenerator):
+    lane_index = RetryScanIndex
+
+
+def scaled_spacing(density):
+    return {entity: (round(low * density), round(high * density)) for entity, (low, high) in SPACING.items()}
+
+
+def time_chunks(generator_class, footprints, chunks, chunk_width, density):
+    generator = generator_class(random.Random(0), footprints, 0, chunk_width, scaled_spacing(density))
+    times = []
+    for _ in range(chunks):
+        start = time.perf_counter()
+        generator.generate_chunk()
+        times.append(time.perf_counter() - start)
+    return sum(times) / chunks, max(times), len(generator.pending) / chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100)
+    parser.add_argument("--chunk-widths", type=int, nargs="+", default=[1, 4, 16], help="in screen widths")
+    args = parser.parse_args()
+
+    footprints = Simulation().footprints
+    print("ms per chunk")
+    print(
+        f"{'screens':>7}  {'density':>8}  {'placed':>6}  {'scan mean':>9}  {'scan max':>8}"
+        f"  {'index mean':>10}  {'index max':>9}"
+    )
+    for screens in args.chunk_widths:
+        chunk_width = screens * SCREEN_WIDTH
+        for name, density in DENSITIES.items():
+            scan_mean, scan_max, placements = time_chunks(
+                RetryScanGenerator, footprints, args.chunks, chunk_width, density
+            )
+            index_mean, index_max, _ = time_chunks(ChunkedWorldGenerator, footprints, args.chunks, chunk_width, density)
+            print(
+                f"{screens:7}  {name:>8}  {placements:6.1f}  {scan_mean * 1000:9.3f}  {scan_max * 1000:8.3f}"
+                f"  {index_mean * 1000:10.3f}  {index_max * 1000:9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Packs every image in assets/ into one pre-packed atlas plus a metadata file:
+
+    python bundle.py
+"""
+import json
+import mmap
+import os
+import pathlib
+
+import arcade
+import PIL.Image
+
+from constants import ASSETS_PATH, BUNDLE_ATLAS_WIDTH, BUNDLE_PATH
+from hitboxes import HitBoxStore
+
+# Transparent pixels kept around each image so neighbours never bleed into one another
+PADDING = 1
+
+
+def source_stamps(source_dir):
+    # Size and modification time of every image, to tell whether a bundle is out of date
+    return {
+        path.name: [path.stat().st_size, path.stat().st_mtime_ns] for path in sorted(source_dir.glob("*.png"))
+    }
+
+
+def pack_shelves(sizes, atlas_width):
+    """
+    Place (name, width, height) rectangles left to right in rows, tallest
+    first. Returns the position of each name and the atlas height.
+    """
+    positions = {}
+    x = y = shelf_height = 0
+    for name, width, height in sorted(sizes, key=lambda size: (-size[2], size[0])):
+        if x + width > atlas_width:
+            x, y, shelf_height = 0, y + shelf_height + PADDING, 0
+        positions[name] = (x, y)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+    return positions, y + shelf_height
+
+
+class AssetBundle:
+    """
+    Every game image in one raw RGBA atlas that is memory-mapped at launch,
+    with a JSON file giving each image's region, UVs and hit box. Textures are
+    cut from the mapped atlas instead of decoding one PNG each, and the hit
+    boxes come precomputed.
+    """
+
+    def __init__(self, path=BUNDLE_PATH, source_dir=ASSETS_PATH):
+        self.path = path
+        self.source_dir = source_dir
+        self.metadata = json.loads((path / "atlas.json").read_text())
+        with open(path / "atlas.rgba", "rb") as atlas_file:
+            self.atlas_map = mmap.mmap(atlas_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.atlas = PIL.Image.frombuffer("RGBA", tuple(self.metadata["size"]), self.atlas_map, "raw", "RGBA", 0, 1)
+        self.textures = {}
+        # Anything not in the bundle falls back to the PNG, with its hit box scan persisted
+        self.hit_boxes = HitBoxStore()
+
+    @classmethod
+    def build(cls, path=BUNDLE_PATH, source_dir=ASSETS_PATH, atlas_width=BUNDLE_ATLAS_WIDTH):
+        hit_boxes = HitBoxStore()
+        images = {}
+        regions = {}
+        for source in sorted(source_dir.glob("*.png")):
+            # Loaded through arcade so the image and hit box are exactly what the game would get
+            texture = hit_boxes.load_texture(source)
+            images[source.name] = texture.image.convert("RGBA")
+            regions[source.name] = {"hit_box": texture.hit_box_points}
+        hit_boxes.save()
+
+        positions, atlas_height = pack_shelves(
+            [(name, image.width, image.height) for name, image in images.items()], atlas_width
+        )
+        atlas = PIL.Image.new("RGBA", (atlas_width, atlas_height), (0, 0, 0, 0))
+        for name, image in images.items():
+            x, y = positions[name]
+            atlas.paste(image, (x, y))
+            regions[name].update(
+                x=x,
+                y=y,
+                width=image.width,
+                height=image.height,
+                uv=[x / atlas_width, y / atlas_height, (x + image.width) / atlas_width, (y + image.height) / atlas_height],
+            )
+
+        # Written under temporary names and moved into place, the atlas before the metadata that
+        # vouches for it, so a build cut short never leaves a bundle that looks current
+        path.mkdir(parents=True, exist_ok=True)
+        metadata = {"size": [atlas_width, atlas_height], "sources": source_stamps(source_dir), "regions": regions}
+        (path / "atlas.rgba.tmp").write_bytes(atlas.tobytes())
+        os.replace(path / "atlas.rgba.tmp", path / "atlas.rgba")
+        (path / "atlas.json.tmp").write_text(json.dumps(metadata))
+        os.replace(path / "atlas.json.tmp", path / "atlas.json")
+
+    @classmethod
+    def is_current(cls, path=BUNDLE_PATH, source_dir=ASSETS_PATH):
+        try:
+            metadata = json.loads((path / "atlas.json").read_text())
+            atlas_size = (path / "atlas.rgba").stat().st_size
+        except (OSError, ValueError):
+            return False
+        width, height = metadata["size"]
+        return metadata["sources"] == source_stamps(source_dir) and atlas_size == width * height * 4
+
+    @classmethod
+    def load_or_build(cls, path=BUNDLE_PATH, source_dir=ASSETS_PATH):
+        # The first launch after an asset changes pays for the build, later ones only map the atlas
+        if cls.is_current(path, source_dir):
+            try:
+                return cls(path, source_dir)
+            except (OSError, ValueError):
+                # Changed or emptied since it was checked; building it again is the way back
+                pass
+        cls.build(path, source_dir)
+        return cls(path, source_dir)
+
+    def load_texture(self, file_name):
+        file_name = pathlib.Path(file_name)
+        region = self.metadata["regions"].get(file_name.name)
+        if region is None or file_name.parent != self.source_dir:
+            texture = self.hit_boxes.load_texture(file_name)
+            # Only writes when the scan was new
+            self.hit_boxes.save()
+            return texture
+
+        if file_name.name not in self.textures:
+            x, y = region["x"], region["y"]
+            image = self.atlas.crop((x, y, x + region["width"], y + region["height"]))
+            texture = arcade.Texture(f"bundle:{file_name.name}", image=image)
+            texture._hit_box_points = tuple(tuple(point) for point in region["hit_box"])
+            self.textures[file_name.name] = texture
+        return self.textures[file_name.name]
+
+
+if __name__ == "__main__":
+    AssetBundle.build()
+    print(f"Bundled {len(source_stamps(ASSETS_PATH))} images into {BUNDLE_PATH}")
@@ -0,0 +1,104 @@
+from arcade.geometry_python import are_polygons_intersecting
+
+from constants import SAT_NUMPY_MIN_CANDIDATES, SPATIAL_HASH_MIN_SPRITES
+from hitboxes import adjusted_hit_box, hit_box_bounds
+
+# NumPy is optional: without it the batched test falls back to one SAT call per candidate
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _edge_normals(points):
+    # Normal of each edge p1 -> p2, (p2.y - p1.y, p1.x - p2.x), the same axes arcade projects onto
+    edges = numpy.roll(points, -1, axis=-2) - points
+    return numpy.stack((edges[..., 1], -edges[..., 0]), axis=-1)
+
+
+def polygons_intersecting_python(polygon, candidates):
+    return [are_polygons_intersecting(polygon, candidate) for candidate in candidates]
+
+
+def polygons_intersecting_numpy(polygon, candidates):
+    """
+    Separating-axis test of one polygon against many, with the projections
+    for every candidate done in a few array operations. Candidates are batched
+    by vertex count. Touching edges do not count as intersecting, as in
+    arcade.are_polygons_intersecting.
+    """
+    a = numpy.asarray(polygon, dtype=float)
+    a_normals = _edge_normals(a)
+    a_on_a = a @ a_normals.T
+    a_min, a_max = a_on_a.min(axis=0), a_on_a.max(axis=0)
+
+    batches = {}
+    for index, candidate in enumerate(candidates):
+        batches.setdefault(len(candidate), []).append(index)
+
+    results = [False] * len(candidates)
+    for indices in batches.values():
+        b = numpy.array([candidates[index] for index in indices], dtype=float)
+
+        # Project both polygons onto the first polygon's edge normals...
+        b_on_a = b @ a_normals.T
+        separated = ((a_max <= b_on_a.min(axis=1)) | (b_on_a.max(axis=1) <= a_min)).any(axis=1)
+
+        # ...and onto each candidate's own edge normals
+        b_normals = _edge_normals(b)
+        a_on_b = b_normals @ a.T
+        b_on_b = b_normals @ b.transpose(0, 2, 1)
+        separated |= (
+            (a_on_b.max(axis=2) <= b_on_b.min(axis=2)) | (b_on_b.max(axis=2) <= a_on_b.min(axis=2))
+        ).any(axis=1)
+
+        for index, is_separated in zip(indices, separated):
+            results[index] = not is_separated
+    return results
+
+
+def polygons_intersecting(polygon, candidates):
+    # One polygon against N, batched through NumPy when it is installed and N is large enough to pay off
+    if numpy is not None and len(candidates) >= SAT_NUMPY_MIN_CANDIDATES:
+        return polygons_intersecting_numpy(polygon, candidates)
+    return polygons_intersecting_python(polygon, candidates)
+
+
+def collides_with_list(sprite, sprite_list):
+    """
+    Drop-in for sprite.collides_with_list(): spatial hash broad phase, then the
+    collision radius check, then a check that the hit boxes' bounds overlap,
+    then one batched SAT call for whatever is left. Hit boxes whose bounds do
+    not overlap cannot intersect, so the extra check only skips SAT calls
+    that would have missed.
+    """
+    # A list of a few sprites is quicker to scan than to look up in its hash
+    if sprite_list.spatial_hash is not None and len(sprite_list) >= SPATIAL_HASH_MIN_SPRITES:
+        nearby = sprite_list.spatial_hash.get_objects_for_box(sprite)
+    else:
+        nearby = sprite_list
+
+    x, y = sprite.position
+    radius = sprite.collision_radius
+    bounds = None
+    candidates = []
+    for other in nearby:
+        if other is sprite:
+            continue
+        other_x, other_y = other.position
+        radius_sum = radius + other.collision_radius
+        if (x - other_x) ** 2 + (y - other_y) ** 2 > radius_sum * radius_sum:
+            continue
+        if bounds is None:
+            bounds = hit_box_bounds(sprite)
+        left, right, bottom, top = bounds
+        o_left, o_right, o_bottom, o_top = hit_box_bounds(other)
+        if left < o_right and right > o_left and bottom < o_top and top > o_bottom:
+            candidates.append(other)
+    if not candidates:
+        return []
+
+    hits = polygons_intersecting(
+        adjusted_hit_box(sprite), [adjusted_hit_box(other) for other in candidates]
+    )
+    return [other for other, hit in zip(candidates, hits) if hit]
@@ -0,0 +1,85 @@
+import pathlib
+
+DEBUG = False
+SCREEN_WIDTH = 900
+SCREEN_HEIGHT = 500
+WINDOW_TITLE = "Jungle Dash"
+BACKGROUND_COLOR = (179, 235, 242)
+# Render the background once offscreen and blit it, instead of drawing it every frame
+USE_BACKGROUND_COMPOSITOR = True
+ASSETS_PATH = pathlib.Path(__file__).resolve().parent / "assets"
+# Hit box scans persisted by image hash, so later launches skip the pixel scan
+HIT_BOX_CACHE_PATH = pathlib.Path(__file__).resolve().parent / ".cache" / "hit-boxes.json"
+# Debug mode streams a record of every frame here, as CSV or as JSON Lines for a .jsonl suffix
+DEBUG_FRAME_LOG_PATH = pathlib.Path(__file__).resolve().parent / "frame-times.csv"
+# Record every game the window plays, for replay.py to re-run headlessly
+RECORD_SESSIONS = False
+RECORDINGS_PATH = pathlib.Path(__file__).resolve().parent / "recordings"
+# Every image packed into one atlas, rebuilt on launch when an asset changes (see bundle.py)
+BUNDLE_PATH = pathlib.Path(__file__).resolve().parent / ".cache" / "bundle"
+BUNDLE_ATLAS_WIDTH = 2048
+GROUND_WIDTH = 500
+LEVEL_WIDTH_PIXELS = GROUND_WIDTH * ((SCREEN_WIDTH * 4) // GROUND_WIDTH)
+ALL_TEXTURES = [
+    "monkey",
+]
+# Speeds in pixels per second and accelerations in pixels per second squared, so
+# movement does not depend on how often the simulation steps
+PLAYER_SPEED = 360
+# How much faster the monkey runs for every second the game has gone on
+PLAYER_ACCELERATION = 4.5
+JUMP_SPEED = 1080
+SURF_SPEED = 360
+GRAVITY = 4320
+MAX_CLOUDS = 2
+CLOUD_YPOS_MIN = 300
+CLOUD_YPOS_MAX = 340
+CLOUD_SPEED = -24
+SPAWN_DISTANCE = SCREEN_WIDTH
+# The level is generated as plain data in chunks this wide, up to WORLD_LOOKAHEAD
+# past the camera. Sprites are built for it up to MATERIALISE_AHEAD, at most
+# MATERIALISE_PER_STEP a simulation step, except that anything closer than
+# MATERIALISE_NOW is about to come into view and is always built straight away.
+# Two a step at SIMULATION_RATE is the four a frame at 60 FPS it used to be
+CHUNK_WIDTH = SCREEN_WIDTH
+WORLD_LOOKAHEAD = SCREEN_WIDTH * 4
+MATERIALISE_AHEAD = SCREEN_WIDTH * 2
+MATERIALISE_NOW = SCREEN_WIDTH + SCREEN_WIDTH // 2
+MATERIALISE_PER_STEP = 2
+# How far behind the camera's left edge an entity has to be before it is retired
+DESPAWN_DISTANCE = SCREEN_WIDTH // 2
+
+# Spatial hash cell sizes for the collidable sprite lists, about the size of
+# the sprites they hold so a query against the monkey touches only a few cells
+OBSTACLE_CELL_SIZE = 256
+BIRD_CELL_SIZE = 128
+BANANA_CELL_SIZE = 128
+PLATFORM_CELL_SIZE = 320
+# Fewest sprites in a list for which a spatial hash query against the monkey
+# beats checking every sprite's bounds; the game's lists rarely hold that many
+SPATIAL_HASH_MIN_SPRITES = 12
+
+# Fewest candidate hit boxes for which the batched NumPy SAT test beats one
+# pure-Python call per candidate (see benchmarks/bench_sat.py)
+SAT_NUMPY_MIN_CANDIDATES = 3
+
+# The simulation steps at this fixed rate, in the window and headless alike,
+# whatever the frame rate (see timestep.py)
+SIMULATION_RATE = 120
+SIMULATION_DT = 1 / SIMULATION_RATE
+# Most frame time caught up in one frame, so a long stall drops time rather than piling up steps
+MAX_FRAME_TIME = 0.25
+# A sprite that moved further than this in one step jumped rather than moved, and is not interpolated
+SNAP_DISTANCE = SCREEN_WIDTH // 2
+# How far ahead the autopilot predicts the monkey's path, how much lower than
+# predicted it allows for the monkey being, and the height it surfs at (of its
+# hit box's bottom), above the tallest plant and below the lowest bird
+AUTOPILOT_HORIZON = 0.6
+AUTOPILOT_MARGIN = 8
+AUTOPILOT_SURF_HEIGHT = 182
+# Seconds each running and flapping keyframe shows for
+ANIMATION_FRAME_TIME = 10 / 60
+
+# Reusable players built up front for each sound, and the most that play at once
+MIXER_VOICES_PER_SOUND = 3
+MIXER_MAX_VOICES = 8
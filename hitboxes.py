@@ -0,0 +1,95 @@
+import hashlib
+import json
+
+import arcade
+
+from constants import HIT_BOX_CACHE_PATH
+
+
+def image_hash(image):
+    # Identifies the pixels, whatever file or sprite sheet region they came from
+    digest = hashlib.sha1(f"{image.mode}{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class HitBoxStore:
+    """
+    Hit box points computed by arcade's "Simple"/"Detailed" pixel scans,
+    persisted by image hash so later launches skip the scan.
+    """
+
+    def __init__(self, path=HIT_BOX_CACHE_PATH):
+        self.path = path
+        self.points = {}
+        self.dirty = False
+        if path.exists():
+            try:
+                self.points = json.loads(path.read_text())
+            except ValueError:
+                self.points = {}
+
+    def apply(self, texture):
+        # Fill in the texture's hit box from the store, or scan it and remember the result
+        algorithm = texture._hit_box_algorithm
+        if algorithm == "None" or texture._hit_box_points is not None:
+            return texture
+        key = f"{image_hash(texture.image)}:{algorithm}:{texture._hit_box_detail}"
+        if key in self.points:
+            texture._hit_box_points = tuple(tuple(point) for point in self.points[key])
+        else:
+            self.points[key] = texture.hit_box_points
+            self.dirty = True
+        return texture
+
+    def load_texture(self, file_name, **kwargs):
+        return self.apply(arcade.load_texture(file_name, **kwargs))
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.points))
+        self.dirty = False
+
+
+# Hit boxes relative to the sprite's centre, already scaled and rotated, keyed by
+# (id of the unscaled points, scale, angle). Sprites sharing a texture share an entry
+_local_hit_boxes = {}
+
+
+def local_hit_box(sprite):
+    """
+    The sprite's scaled and rotated hit box about its centre, with its
+    (left, right, bottom, top) extent. Only rebuilt when the points, scale or
+    angle change, so a sprite that only moves costs a dictionary lookup.
+    """
+    points = sprite.hit_box
+    scale = sprite.scale
+    angle = sprite.angle
+    entry = _local_hit_boxes.get((id(points), scale, angle))
+    if entry is None or entry[0] is not points:
+        local = []
+        for point in points:
+            if angle:
+                point = arcade.rotate_point(point[0], point[1], 0, 0, angle)
+            local.append((point[0] * scale, point[1] * scale))
+        xs = [point[0] for point in local]
+        ys = [point[1] for point in local]
+        # Keep the points alive so their id can't be reused by another hit box
+        entry = (points, local, (min(xs), max(xs), min(ys), max(ys)))
+        _local_hit_boxes[(id(points), scale, angle)] = entry
+    return entry[1], entry[2]
+
+
+def adjusted_hit_box(sprite):
+    # World-space hit box, the same points as sprite.get_adjusted_hit_box() but from the shared local box plus an offset
+    x, y = sprite.position
+    return [(x + px, y + py) for px, py in local_hit_box(sprite)[0]]
+
+
+def hit_box_bounds(sprite):
+    # Axis-aligned (left, right, bottom, top) of the sprite's hit box in world space
+    x, y = sprite.position
+    left, right, bottom, top = local_hit_box(sprite)[1]
+    return x + left, x + right, y + bottom, y + top
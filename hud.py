@@ -0,0 +1,69 @@
+import arcade
+
+from constants import ASSETS_PATH, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import GameStates
+
+HEALTH_BAR_COLOR = arcade.color.GREEN
+HEALTH_BAR_GAME_OVER_COLOR = (152, 204, 159)
+
+
+class Hud:
+    """
+    Score, timer and game-over text as persistent arcade.Text objects, plus the
+    health bar as a ShapeElementList and the heart in its own SpriteList. Each
+    piece is only rebuilt when the value it shows changes, so the bar and the
+    heart cost one draw call each.
+    """
+
+    def __init__(self, assets):
+        self.timer_text = arcade.Text(text="00:00:00", start_x=SCREEN_WIDTH - 200, start_y=SCREEN_HEIGHT - 85, color=arcade.color.BLACK, font_size=20)
+        self.score_text = arcade.Text(text="Score: 00000", start_x=SCREEN_WIDTH - 200, start_y=SCREEN_HEIGHT - 50, color=arcade.color.BLACK, font_size=20)
+        self.game_over_text = arcade.Text("G A M E   O V E R", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80, arcade.color.BLACK, 30, anchor_x="center")
+        self.restart_text = arcade.Text("press the space bar to restart", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 120, arcade.color.BLACK, 15, anchor_x="center")
+
+        # Heart graphic setup
+        self.heart_list = arcade.SpriteList()
+        heart = arcade.Sprite(texture=assets.load_texture(ASSETS_PATH / "heart.png"))
+        heart.center_x = 28
+        heart.center_y = SCREEN_HEIGHT - 30
+        self.heart_list.append(heart)
+
+        self.health_bar = arcade.ShapeElementList()
+        self.shown_timer = None
+        self.shown_score = None
+        self.shown_health = None
+        self.game_over = False
+
+    def update(self, sim):
+        elapsed_time = sim.elapsed_time
+        minutes = int(elapsed_time) // 60
+        seconds = int(elapsed_time) % 60
+        milliseconds = int((elapsed_time - seconds) * 100)
+        if (minutes, seconds, milliseconds) != self.shown_timer:
+            self.shown_timer = (minutes, seconds, milliseconds)
+            self.timer_text.text = f"Timer: {minutes}:{seconds}:{milliseconds}"
+
+        if sim.score != self.shown_score:
+            self.shown_score = sim.score
+            self.score_text.text = f"Score: {sim.score:05}"
+
+        self.game_over = sim.game_state == GameStates.GAMEOVER
+        if (sim.health, sim.health_x, self.game_over) != self.shown_health:
+            self.shown_health = (sim.health, sim.health_x, self.game_over)
+            self.build_health_bar(sim.health, sim.health_x)
+
+    def build_health_bar(self, health, health_x):
+        # The outline and the fill are both triangle strips, so the list draws them in one batch
+        color = HEALTH_BAR_GAME_OVER_COLOR if self.game_over else HEALTH_BAR_COLOR
+        self.health_bar = arcade.ShapeElementList()
+        self.health_bar.append(arcade.create_rectangle_outline(150, SCREEN_HEIGHT - 30, 200, 20, arcade.color.BLACK, 2))
+        self.health_bar.append(arcade.create_rectangle_filled(health_x + 50, SCREEN_HEIGHT - 30, health, 20, color))
+
+    def draw(self):
+        self.timer_text.draw()
+        self.score_text.draw()
+        if self.game_over:
+            self.game_over_text.draw()
+            self.restart_text.draw()
+        self.health_bar.draw()
+        self.heart_list.draw()
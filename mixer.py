@@ -0,0 +1,151 @@
+import math
+import threading
+import time
+from collections import deque
+
+from arcade.resources import resolve_resource_path
+from pyglet import media
+
+from constants import MIXER_MAX_VOICES, MIXER_VOICES_PER_SOUND
+
+
+class SoundHandle:
+    """
+    A sound file declared without decoding it, so declaring sounds at import
+    costs nothing. load() decodes it into a static source once; source is
+    None until then.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.source = None
+
+    def load(self):
+        if self.source is None:
+            self.source = media.load(str(resolve_resource_path(self.file_name)), streaming=False)
+        return self.source
+
+
+class Voice(media.Player):
+    """
+    A player for one static source that stays on it after it finishes, so
+    playing it again only rewinds it and keeps its audio source.
+    """
+
+    def __init__(self, source, volume=1.0, pan=0.0):
+        super().__init__()
+        self.volume = volume
+        # Panning with 3D audio, as arcade.Sound.play does it
+        self.position = (pan, 0.0, math.sqrt(1 - pan ** 2))
+        self.duration = source.duration
+        self.stopped = True
+        self.queue(source)
+
+    @property
+    def finished(self):
+        # Having played to the end counts, as not every audio driver sends on_eos
+        return self.stopped or self.time >= self.duration
+
+    def on_eos(self):
+        # Player.on_eos would move on to the next source and delete the audio player
+        self.pause()
+        self.stopped = True
+
+    def start(self):
+        self.seek(0.0)
+        self.stopped = False
+        self.play()
+
+    def stop(self):
+        self.pause()
+        self.stopped = True
+
+
+class SoundMixer:
+    """
+    Plays sounds by key through a fixed pool of Voices per sound, built the
+    first time the sound is cued, instead of a new player for every cue. At
+    most max_voices play at once and the oldest is stolen for a new cue
+    beyond that; a sound whose own voices are all busy restarts its oldest
+    one. A sound cued more than once in a frame plays once, and a cue for a
+    sound that has not loaded yet is skipped.
+
+    sounds maps each key to a SoundHandle.
+    """
+
+    def __init__(self, sounds, voices_per_sound=MIXER_VOICES_PER_SOUND, max_voices=MIXER_MAX_VOICES,
+                 volume=1.0, pan=0.0):
+        self.sounds = sounds
+        self.voices_per_sound = voices_per_sound
+        self.max_voices = max_voices
+        self.volume = volume
+        self.pan = pan
+        self.allocations = 0
+        self.plays = 0
+        self.steals = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self.voices = {}
+        # Voices that have been started and not finished or stolen, oldest first
+        self.playing = deque()
+
+    def load_in_background(self):
+        # Decode every sound on a daemon thread, so nothing waits on audio decoding
+        loader = threading.Thread(target=self.load_all, name="sound-loader", daemon=True)
+        loader.start()
+        return loader
+
+    def load_all(self):
+        for sound in self.sounds.values():
+            sound.load()
+
+    def voices_for(self, key):
+        # The sound's voices, built the first time it is cued after it has loaded
+        voices = self.voices.get(key)
+        source = self.sounds[key].source
+        if voices is None and source is not None:
+            voices = self.voices[key] = [self.allocate(source) for _ in range(self.voices_per_sound)]
+        return voices
+
+    def allocate(self, source):
+        self.allocations += 1
+        return Voice(source, self.volume, self.pan)
+
+    def play_frame(self, keys):
+        # Everything cued in one frame, each sound once
+        cued = dict.fromkeys(keys)
+        self.duplicates += len(keys) - len(cued)
+        for key in cued:
+            self.play(key)
+
+    def play(self, key):
+        voices = self.voices_for(key)
+        if voices is None:
+            self.skipped += 1
+            return
+        self.playing = deque(voice for voice in self.playing if not voice.finished)
+        voice = next((voice for voice in voices if voice.finished), None)
+        if voice is None:
+            voice = next(voice for voice in self.playing if voice in voices)
+            self.playing.remove(voice)
+            self.steals += 1
+        elif len(self.playing) >= self.max_voices:
+            self.playing.popleft().stop()
+            self.steals += 1
+        voice.start()
+        self.playing.append(voice)
+        self.plays += 1
+
+    def stats(self):
+        # Running totals, with plays and player allocations per minute since the mixer was built
+        minutes = max(time.perf_counter() - self.started, 1e-9) / 60
+        return {
+            "plays": self.plays,
+            "plays_per_minute": self.plays / minutes,
+            "allocations": self.allocations,
+            "allocations_per_minute": self.allocations / minutes,
+            "steals": self.steals,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,126 @@
+import csv
+import json
+import pathlib
+import time
+
+import arcade
+import arcade.gl
+
+
+class DrawCallCounter:
+    """
+    Counts draw calls by wrapping arcade.gl.Geometry.render, which every
+    arcade sprite list, shape list and draw_* command goes through. Text is
+    drawn by pyglet directly and is not counted.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_frame = 0
+
+    def install(self):
+        render = arcade.gl.Geometry.render
+        counter = self
+
+        def counted_render(geometry, *args, **kwargs):
+            counter.count += 1
+            return render(geometry, *args, **kwargs)
+
+        arcade.gl.Geometry.render = counted_render
+
+    def end_frame(self):
+        self.last_frame = self.count
+        self.count = 0
+
+
+# Phases of a frame's update and of its draw, in the order the overlay and frame log list them.
+# "input" is the autopilot's decision and the session recorder, before each step's rules run
+UPDATE_PHASES = ("input", "animation", "clouds", "physics", "spawning", "pickups", "obstacles", "camera", "sound", "hud")
+DRAW_PHASES = ("background", "scene", "hud")
+
+
+class PhaseTimer:
+    """
+    Splits one frame's update into UPDATE_PHASES, or its draw into
+    DRAW_PHASES. mark(phase) charges the time since the previous mark to that
+    phase, so the frame is timed by a perf_counter call at each phase
+    boundary. begin() starts a frame, and update phases add up over every
+    simulation step the frame takes.
+    """
+
+    def __init__(self, phases=UPDATE_PHASES):
+        self.phases = phases
+        self.totals = dict.fromkeys(phases, 0.0)
+        self.last = time.perf_counter()
+
+    def begin(self):
+        self.totals = dict.fromkeys(self.phases, 0.0)
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.totals[phase] += now - self.last
+        self.last = now
+
+
+class NullPhaseTimer:
+    # Stands in for PhaseTimer when nothing is being measured
+    def begin(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+
+class FrameLog:
+    """
+    Streams one record per frame to a CSV or JSON Lines file, chosen by the
+    file's suffix. Lines are flushed as they are written, so the file can be
+    followed while the game runs.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.file = open(self.path, "w", buffering=1, newline="")
+        self.writer = None
+
+    def write(self, record):
+        if self.path.suffix == ".jsonl":
+            self.file.write(json.dumps(record) + "\n")
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(record))
+            self.writer.writeheader()
+        self.writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+
+class DebugOverlay:
+    """
+    Live readout of the latest frame record: FPS, update and draw time
+    split into phases, draw calls, the sprite count of each list and
+    the sound mixer's counters.
+    """
+
+    def __init__(self, x, y):
+        self.text = arcade.Text("", x, y, arcade.color.BLACK, 10, width=680, multiline=True, anchor_y="top")
+
+    def update(self, record):
+        phases = "  ".join(f"{phase} {record[f'{phase}_ms']:.2f}" for phase in UPDATE_PHASES)
+        draw_phases = "  ".join(f"{phase} {record[f'draw_{phase}_ms']:.2f}" for phase in DRAW_PHASES)
+        sprites = "  ".join(f"{key[:-len('_sprites')]} {value}" for key, value in record.items() if key.endswith("_sprites"))
+        self.text.text = "\n".join((
+            f"FPS {record['fps']:.0f}  update {record['update_ms']:.2f} ms ({record['steps']} steps)  draw {record['draw_ms']:.2f} ms"
+            f"  draw calls {record['draw_calls']} (HUD {record['hud_draw_calls']})",
+            f"update ms: {phases}",
+            f"draw ms: {draw_phases}",
+            f"sprites: {sprites}",
+            f"sound: plays/min {record['sound_plays_per_minute']:.0f}  players allocated {record['sound_allocations']}"
+            f" ({record['sound_allocations_per_minute']:.1f}/min)  stolen {record['sound_steals']}"
+            f"  de-duplicated {record['sound_duplicates']}  skipped while loading {record['sound_skipped']}",
+        ))
+
+    def draw(self):
+        self.text.draw()
@@ -0,0 +1,100 @@
+from constants import GRAVITY, SPATIAL_HASH_MIN_SPRITES
+from hitboxes import hit_box_bounds
+
+
+class RunnerPhysicsEngine:
+    """
+    Platformer physics for an endless runner: a flat ground plus axis-aligned
+    floating platforms. Contacts are resolved from the AABB penetration depth
+    in one move, rather than nudging the player out pixel by pixel the way
+    arcade.PhysicsEnginePlatformer does. Exposes the same jump()/can_jump()
+    surface.
+
+    Platforms break when the player jumps into them from below: the first hit
+    swaps in broken_platform_texture and stops the jump, the second hands the
+    platform to release_platform.
+
+    change_x and change_y are velocities in pixels per second and gravity
+    is in pixels per second squared, integrated over each update's
+    delta_time.
+    """
+
+    def __init__(self, player_sprite, ground_list, platform_list, gravity_constant=GRAVITY,
+                 broken_platform_texture=None, release_platform=None):
+        self.player_sprite = player_sprite
+        self.platform_list = platform_list
+        self.gravity_constant = gravity_constant
+        self.broken_platform_texture = broken_platform_texture
+        self.release_platform = release_platform
+
+        # The ground is a row of identical segments, so its top is the same everywhere
+        self.ground_top = hit_box_bounds(ground_list[0])[3] if len(ground_list) else 0
+
+    def nearby_platforms(self):
+        # Broad phase through the platform list's spatial hash when it has one and enough platforms to pay off
+        if self.platform_list.spatial_hash is not None and len(self.platform_list) >= SPATIAL_HASH_MIN_SPRITES:
+            return self.platform_list.spatial_hash.get_objects_for_box(self.player_sprite)
+        return list(self.platform_list)
+
+    def overlapping_platforms(self, left, right, bottom, top):
+        overlapping = []
+        for platform in self.nearby_platforms():
+            p_left, p_right, p_bottom, p_top = hit_box_bounds(platform)
+            if left < p_right and right > p_left and bottom < p_top and top > p_bottom:
+                overlapping.append((platform, p_bottom, p_top))
+        return overlapping
+
+    def can_jump(self, y_distance=5):
+        left, right, bottom, top = hit_box_bounds(self.player_sprite)
+        if bottom - y_distance <= self.ground_top:
+            return True
+        return len(self.overlapping_platforms(left, right, bottom - y_distance, bottom)) > 0
+
+    def jump(self, velocity):
+        self.player_sprite.change_y = velocity
+
+    def break_platforms_overhead(self):
+        # Only called while jumping or surfing, for platforms the player rises into
+        player = self.player_sprite
+        if player.change_y <= 0:
+            return
+        for platform, p_bottom, p_top in self.overlapping_platforms(*hit_box_bounds(player)):
+            if player.center_y >= platform.center_y:
+                continue
+            if platform.is_broken:
+                self.release_platform(platform)
+            else:
+                platform.texture = self.broken_platform_texture
+                platform.is_broken = True
+                player.top = platform.bottom
+                player.change_y = 0
+            return
+
+    def update(self, delta_time):
+        """
+        Apply gravity and move the player over delta_time, then settle it on the
+        ground or on a platform it fell onto. Returns True if it is standing on
+        a platform.
+        """
+        player = self.player_sprite
+        player.change_y -= self.gravity_constant * delta_time
+        player.center_y += player.change_y * delta_time
+        player.center_x += player.change_x * delta_time
+
+        left, right, bottom, top = hit_box_bounds(player)
+        if bottom < self.ground_top:
+            player.center_y += self.ground_top - bottom
+            player.change_y = 0
+            return False
+
+        # Land on the highest platform whose top the player's hit box has sunk into
+        landed_on = None
+        for platform, p_bottom, p_top in self.overlapping_platforms(left, right, bottom, top):
+            if player.center_y > p_top and (landed_on is None or p_top > landed_on):
+                landed_on = p_top
+        if landed_on is None:
+            return False
+
+        player.center_y += landed_on - bottom
+        player.change_y = 0
+        return True
@@ -0,0 +1,39 @@
+import arcade
+
+
+class SpritePool:
+    """
+    Recycles sprites of one entity type. Consumed sprites are released back
+    here instead of being dropped, and spawners re-arm them with acquire().
+    """
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, texture):
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            if sprite.texture is not texture:
+                sprite.texture = texture
+                sprite.hit_box = texture.hit_box_points
+            return sprite
+
+        self.misses += 1
+        return arcade.Sprite(texture=texture, scale=self.scale)
+
+    def release(self, sprite):
+        sprite.remove_from_sprite_lists()
+        sprite.change_x = 0
+        sprite.change_y = 0
+        self.free.append(sprite)
+
+    def release_all(self, sprite_list):
+        for sprite in list(sprite_list):
+            self.release(sprite)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "free": len(self.free)}
@@ -0,0 +1,100 @@
+"""
+Re-runs a recorded game headlessly, as fast as the simulation can step:
+
+    python replay.py recordings/session-1234.json
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import time
+
+from simulation import Actions, Simulation
+
+
+class SessionRecorder:
+    """
+    Everything needed to re-run one game exactly: its seed, the delta_time of
+    every step and every press/release with the frame it happened on.
+    overrides are attributes set on the simulation straight after reset(),
+    such as the unlimited health the benchmarks use.
+    """
+
+    def __init__(self, seed, overrides=None):
+        self.seed = seed
+        self.overrides = overrides or {}
+        self.delta_times = []
+        self.inputs = []
+
+    def record_step(self, delta_time):
+        self.delta_times.append(delta_time)
+
+    def record_input(self, frame, kind, action):
+        self.inputs.append([frame, kind, action.name])
+
+    def session(self):
+        return {
+            "seed": self.seed,
+            "overrides": self.overrides,
+            "delta_times": self.delta_times,
+            "inputs": self.inputs,
+        }
+
+    def save(self, path):
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.session()))
+
+
+def load_session(path):
+    return json.loads(pathlib.Path(path).read_text())
+
+
+def replay(session, sim=None):
+    """
+    Play a session back on sim, or a new headless Simulation. Returns the
+    simulation and the wall-clock time of every step.
+    """
+    sim = sim or Simulation()
+    sim.reset(session["seed"])
+    for name, value in session["overrides"].items():
+        setattr(sim, name, value)
+
+    inputs = iter(sorted(session["inputs"], key=lambda entry: entry[0]))
+    pending = next(inputs, None)
+    step_times = []
+    for frame, delta_time in enumerate(session["delta_times"]):
+        # Inputs land before the step they were pressed ahead of, as in the live game
+        while pending is not None and pending[0] == frame:
+            _, kind, action = pending
+            (sim.press if kind == "press" else sim.release)(Actions[action])
+            pending = next(inputs, None)
+        start = time.perf_counter()
+        sim.step(delta_time)
+        step_times.append(time.perf_counter() - start)
+    return sim, step_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("session", type=pathlib.Path)
+    parser.add_argument("--repeat", type=int, default=1, help="replay the session this many times")
+    args = parser.parse_args()
+
+    session = load_session(args.session)
+    sim = Simulation()
+    for run in range(args.repeat):
+        start = time.perf_counter()
+        sim, step_times = replay(session, sim)
+        wall = time.perf_counter() - start
+        step_times.sort()
+        print(
+            f"run {run + 1}: {len(step_times)} steps, {sim.elapsed_time:.1f} game s in {wall:.2f} wall s, "
+            f"score {sim.score}, health {sim.health}, step ms "
+            f"p50 {statistics.median(step_times) * 1000:.3f}  p99 {step_times[int(len(step_times) * 0.99)] * 1000:.3f}"
+            f"  max {step_times[-1] * 1000:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,518 @@
+import arcade
+from enum import Enum
+import random
+
+from constants import (
+    ALL_TEXTURES,
+    ANIMATION_FRAME_TIME,
+    ASSETS_PATH,
+    BANANA_CELL_SIZE,
+    BIRD_CELL_SIZE,
+    CLOUD_SPEED,
+    CLOUD_YPOS_MAX,
+    CLOUD_YPOS_MIN,
+    DESPAWN_DISTANCE,
+    GRAVITY,
+    GROUND_WIDTH,
+    JUMP_SPEED,
+    LEVEL_WIDTH_PIXELS,
+    MATERIALISE_AHEAD,
+    MATERIALISE_NOW,
+    MATERIALISE_PER_STEP,
+    MAX_CLOUDS,
+    OBSTACLE_CELL_SIZE,
+    PLATFORM_CELL_SIZE,
+    PLAYER_ACCELERATION,
+    PLAYER_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SIMULATION_DT,
+    SPAWN_DISTANCE,
+    SURF_SPEED,
+    WORLD_LOOKAHEAD,
+)
+from animation import KeyframeSpriteList, PhaseClock, animate_list
+from bundle import AssetBundle
+from collision import collides_with_list
+from hitboxes import hit_box_bounds
+from perf import NullPhaseTimer
+from physics import RunnerPhysicsEngine
+from pools import SpritePool
+from textures import (
+    BIRD_FLYING_TEXTURES,
+    MONKEY_VARIANT_TEXTURES,
+    MonkeyVariants,
+    TextureKeys,
+    load_texture_registry,
+    uniform_keyframes,
+)
+from worldgen import SPACING, ChunkedWorldGenerator, Entities, Footprint
+
+MonkeyStates = Enum("MonkeyStates", "IDLING RUNNING JUMPING CRASHING SURFING")
+GameStates = Enum("GameStates", "PLAYING GAMEOVER")
+Actions = Enum("Actions", "JUMP UP DOWN")
+# Declared in the order pickups resolve, so a special banana doubles a regular one collected alongside it
+BananaKinds = Enum("BananaKinds", "SPECIAL SHIELD REGULAR")
+
+# Things that happened during a step, for the window to play sounds for
+GameEvents = Enum("GameEvents", "BANANA_COLLECTED SPECIAL_BANANA_COLLECTED SHIELD_BANANA_COLLECTED OBSTACLE_HIT GAME_OVER")
+
+BANANA_KINDS = {
+    TextureKeys.BANANA: BananaKinds.REGULAR,
+    TextureKeys.SPECIAL_BANANA: BananaKinds.SPECIAL,
+    TextureKeys.SHIELD_BANANA: BananaKinds.SHIELD,
+}
+
+
+def collidable_list(cell_size):
+    return arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=cell_size)
+
+
+class Simulation:
+    """
+    The game world and its rules, without a window. The window renders the
+    sprite lists held here and feeds key presses in as Actions; headless runs
+    just call step() as fast as they like.
+    """
+
+    def __init__(self, despawn_distance=DESPAWN_DISTANCE, assets=None, spacing=SPACING):
+        # None keeps every entity for the whole run
+        self.despawn_distance = despawn_distance
+        # Gap range between entities of each kind, for the world generator
+        self.spacing = spacing
+        self.monkey_state = MonkeyStates.IDLING
+        self.events = []
+        # Swapped for a perf.PhaseTimer to split each step's time into phases
+        self.phase_timer = NullPhaseTimer()
+        # A replay.SessionRecorder logs every step and input while set
+        self.recorder = None
+        # An autopilot.Autopilot plays before every step while set
+        self.autopilot = None
+
+        # Sprite lists, sprites and the physics engine are built once here and
+        # kept for every game; reset() only rewinds the gameplay state
+        self.floating_platform_list = collidable_list(PLATFORM_CELL_SIZE)
+        self.bananas_list = arcade.SpriteList()
+        self.special_bananas_list = arcade.SpriteList()
+        self.shield_bananas_list = arcade.SpriteList()
+        self.bananas = collidable_list(BANANA_CELL_SIZE)
+        self.obstacles_list = collidable_list(OBSTACLE_CELL_SIZE)
+        # Every bird shows the same keyframe, swapped for the whole list at once
+        self.birds_list = KeyframeSpriteList(use_spatial_hash=True, spatial_hash_cell_size=BIRD_CELL_SIZE)
+        self.banana_lists = {
+            BananaKinds.REGULAR: self.bananas_list,
+            BananaKinds.SPECIAL: self.special_bananas_list,
+            BananaKinds.SHIELD: self.shield_bananas_list,
+        }
+
+        # Pools outlive a game, so a restart re-arms the previous game's sprites
+        self.obstacle_pool = SpritePool()
+        self.bird_pool = SpritePool()
+        self.banana_pool = SpritePool()
+        self.platform_pool = SpritePool(scale=0.5)
+
+        # Textures are loaded once and shared by every game
+        self.assets = assets or AssetBundle.load_or_build()
+        self.textures = {
+            tex: self.assets.load_texture(ASSETS_PATH / f"{tex}.png") for tex in ALL_TEXTURES
+        }
+        self.cloud_texture = self.assets.load_texture(ASSETS_PATH / "cloud.png")
+        self.horizon_texture = self.assets.load_texture(ASSETS_PATH / "horizon.png")
+        # Texture registry, so animation only swaps texture references
+        self.texture_registry = load_texture_registry(self.assets)
+        self.bird_flying = uniform_keyframes([self.texture_registry[key] for key in BIRD_FLYING_TEXTURES])
+        # Every bird flaps in step off one clock, and the running monkey has its own
+        self.bird_clock = PhaseClock(ANIMATION_FRAME_TIME, len(self.bird_flying))
+        self.monkey_clock = PhaseClock(ANIMATION_FRAME_TIME, len(MONKEY_VARIANT_TEXTURES[MonkeyVariants.NORMAL][0]))
+        # Sizes the world generator places entities by, at the scale each pool spawns them
+        self.footprints = {key: Footprint(texture) for key, texture in self.texture_registry.items()}
+        self.footprints[TextureKeys.PLATFORM] = Footprint(self.texture_registry[TextureKeys.PLATFORM], self.platform_pool.scale)
+        self.footprints[TextureKeys.BIRD] = Footprint(self.bird_flying[0])
+
+        # Clouds setup
+        self.clouds_list = arcade.SpriteList()
+        for i in range(MAX_CLOUDS):
+            self.clouds_list.append(arcade.Sprite(texture=self.cloud_texture))
+
+        # Horizon setup
+        self.horizon_list = arcade.SpriteList()
+        for col in range(LEVEL_WIDTH_PIXELS // GROUND_WIDTH):
+            horizon_sprite = arcade.Sprite(texture=self.horizon_texture)
+            horizon_sprite.left = GROUND_WIDTH * (col - 1)
+            horizon_sprite.bottom = 0
+            self.horizon_list.append(horizon_sprite)
+
+        # Monkey setup, with every power-up variant's textures resolved once
+        self.monkey_variants = {
+            variant: (
+                [self.texture_registry[key] for key in running],
+                self.texture_registry[jumping],
+                self.texture_registry[surfing],
+            )
+            for variant, (running, jumping, surfing) in MONKEY_VARIANT_TEXTURES.items()
+        }
+        self.monkey_variant = None
+        self.set_monkey_variant(MonkeyVariants.NORMAL)
+        self.player_sprite = arcade.Sprite(texture=self.player_sprite_running[0])
+        self.player_list = arcade.SpriteList()
+        self.player_list.append(self.player_sprite)
+
+        # Physics engine, which also lands the monkey on platforms and breaks them
+        self.physics_engine = RunnerPhysicsEngine(
+            self.player_sprite,
+            self.horizon_list,
+            self.floating_platform_list,
+            gravity_constant=GRAVITY,
+            broken_platform_texture=self.texture_registry[TextureKeys.BROKEN_PLATFORM],
+            release_platform=self.platform_pool.release,
+        )
+
+    def reset(self, seed=None):
+        """
+        Start a new game on the objects built in __init__: entities go back to
+        their pools and every list, sprite and GPU buffer is reused, so nothing
+        is reloaded or rebuilt. Every random draw in the game comes from a
+        stream seeded with seed, a fresh one when it is None, so the seed and
+        the inputs reproduce the game exactly.
+        """
+        # Return the previous game's sprites to their pools
+        self.obstacle_pool.release_all(self.obstacles_list)
+        self.bird_pool.release_all(self.birds_list)
+        self.banana_pool.release_all(self.bananas)
+        self.platform_pool.release_all(self.floating_platform_list)
+
+        self.events = []
+        self.elapsed_time = 0.0
+        self.score = 0
+        self.health = 200
+        self.health_x = 100
+        self.player_speed = PLAYER_SPEED
+        self.game_state = GameStates.PLAYING
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        # Steps taken this game, which recorded inputs are keyed by
+        self.frame = 0
+
+        # Scatter the clouds again
+        for cloud_sprite in self.clouds_list:
+            cloud_sprite.left = self.rng.randint(0, SCREEN_WIDTH)
+            cloud_sprite.top = self.rng.randint(CLOUD_YPOS_MIN, CLOUD_YPOS_MAX)
+
+        # Lay the horizon segments back out from the start of the level
+        for col, horizon_sprite in enumerate(self.horizon_list):
+            horizon_sprite.left = GROUND_WIDTH * (col - 1)
+
+        # Monkey back at the start, standing still with the normal texture and hit box
+        self.set_monkey_variant(MonkeyVariants.NORMAL)
+        self.player_sprite.texture = self.textures["monkey"]
+        self.player_sprite.hit_box = self.textures["monkey"].hit_box_points
+        self.player_sprite.center_x = 200
+        self.player_sprite.center_y = 120
+        self.player_sprite.change_x = 0
+        self.player_sprite.change_y = 0
+        self.monkey_state = MonkeyStates.RUNNING
+        self.monkey_clock.reset()
+        self.bird_clock.reset()
+        self.birds_list.set_keyframe(self.bird_flying[0])
+        self.camera_x = 0
+        self.physics_engine.gravity_constant = GRAVITY
+
+        self.special_banana_timer = 0.0
+        self.special_banana_active = False
+        self.shield_banana_timer = 0.0
+        self.shield_banana_active = False
+        self.floating_platform_broken = False
+
+        # The level starts a screen ahead of the monkey, and everything up to
+        # MATERIALISE_AHEAD is built now rather than over the first steps
+        self.world = ChunkedWorldGenerator(
+            self.rng, self.footprints, self.player_sprite.center_x + SPAWN_DISTANCE, spacing=self.spacing
+        )
+        self.spawn_ahead(budget=float("inf"))
+
+    def set_monkey_variant(self, variant):
+        # Called every step, but only swaps the texture references when a power-up starts or ends
+        if variant == self.monkey_variant:
+            return
+        self.monkey_variant = variant
+        self.player_sprite_running, self.player_sprite_jumping, self.player_sprite_surfing = self.monkey_variants[variant]
+
+    def press(self, action):
+        if self.recorder:
+            self.recorder.record_input(self.frame, "press", action)
+        if action == Actions.JUMP and self.monkey_state != MonkeyStates.JUMPING:
+            self.monkey_state = MonkeyStates.JUMPING
+            self.physics_engine.jump(JUMP_SPEED)
+        elif action == Actions.UP and self.monkey_state == MonkeyStates.SURFING:
+            self.player_sprite.change_y = SURF_SPEED
+        elif action == Actions.DOWN and self.monkey_state == MonkeyStates.SURFING:
+            self.player_sprite.change_y = -SURF_SPEED
+
+    def release(self, action):
+        if self.recorder:
+            self.recorder.record_input(self.frame, "release", action)
+        if action == Actions.JUMP:
+            self.monkey_state = MonkeyStates.RUNNING
+            self.player_sprite.hit_box = self.textures["monkey"].hit_box_points
+            if self.player_sprite.center_y < 44:
+                self.player_sprite.center_y = 44
+
+    def calculate_player_speed(self, base_speed, elapsed_time, acceleration=PLAYER_ACCELERATION):
+        return base_speed + (acceleration * elapsed_time)
+
+    def materialise(self, placement):
+        # Build the sprite for one generated Placement, from its entity's pool,
+        # positioned before it joins the spatially hashed lists
+        texture = self.texture_registry[placement.texture_key]
+        if placement.entity == Entities.OBSTACLE:
+            sprite = self.obstacle_pool.acquire(texture)
+            lists = (self.obstacles_list,)
+        elif placement.entity == Entities.BIRD:
+            sprite = self.bird_pool.acquire(self.bird_flying[self.bird_clock.frame])
+            lists = (self.birds_list,)
+        elif placement.entity == Entities.PLATFORM:
+            sprite = self.platform_pool.acquire(texture)
+            sprite.is_broken = False
+            lists = (self.floating_platform_list,)
+        else:
+            sprite = self.banana_pool.acquire(texture)
+            sprite.kind = BANANA_KINDS[placement.texture_key]
+            lists = (self.banana_lists[sprite.kind], self.bananas)
+        sprite.left = placement.left
+        sprite.bottom = placement.bottom
+        # Entities never move once placed, so where they scroll out of play is known now
+        sprite.despawn_x = sprite.right
+        for sprite_list in lists:
+            sprite_list.append(sprite)
+
+    def spawn_ahead(self, budget=MATERIALISE_PER_STEP):
+        """
+        Generate chunks up to WORLD_LOOKAHEAD past the camera, then build
+        sprites for the pending placements up to MATERIALISE_AHEAD, at most
+        budget of them. Placements about to come into view are built even
+        over budget, so nothing ever pops in on screen.
+        """
+        self.world.generate_until(self.camera_x + WORLD_LOOKAHEAD)
+        pending = self.world.pending
+        while pending and pending[0].left < self.camera_x + MATERIALISE_AHEAD:
+            if budget <= 0 and pending[0].left >= self.camera_x + MATERIALISE_NOW:
+                break
+            self.materialise(pending.popleft())
+            budget -= 1
+
+    def collect_bananas(self):
+        # One broad-phase query over every banana, dispatched on the kind each was spawned with
+        collected = collides_with_list(self.player_sprite, self.bananas)
+        for banana in sorted(collected, key=lambda banana: banana.kind.value):
+            if banana.kind == BananaKinds.SPECIAL:
+                self.events.append(GameEvents.SPECIAL_BANANA_COLLECTED)
+                self.special_banana_active = True
+                self.special_banana_timer = 5.0
+            elif banana.kind == BananaKinds.SHIELD:
+                self.events.append(GameEvents.SHIELD_BANANA_COLLECTED)
+                self.shield_banana_active = True
+                self.shield_banana_timer = 5.0
+            else:
+                self.events.append(GameEvents.BANANA_COLLECTED)
+                if self.special_banana_active:
+                    self.score += 20
+                    if self.health < 200:
+                        self.health += 12
+                        self.health_x += 6
+                else:
+                    self.score += 10
+                    if self.health < 200:
+                        self.health += 6
+                        self.health_x += 3
+            self.banana_pool.release(banana)
+
+    def despawn_behind_camera(self):
+        # Retire entities that scrolled far enough past the camera's left edge
+        if self.despawn_distance is None:
+            return
+        cutoff = self.camera_x - self.despawn_distance
+        for sprite_list, pool in (
+            (self.obstacles_list, self.obstacle_pool),
+            (self.birds_list, self.bird_pool),
+            (self.bananas, self.banana_pool),
+            (self.floating_platform_list, self.platform_pool),
+        ):
+            # Sprites join each list in the order they were placed, left to right, so
+            # everything to retire is at the head and the first one still in play ends the scan
+            while sprite_list and sprite_list[0].despawn_x < cutoff:
+                pool.release(sprite_list[0])
+
+    def sprite_counts(self):
+        return {
+            "obstacles": len(self.obstacles_list),
+            "birds": len(self.birds_list),
+            "bananas": len(self.bananas),
+            "platforms": len(self.floating_platform_list),
+            "clouds": len(self.clouds_list),
+            "horizon": len(self.horizon_list),
+        }
+
+    def pool_stats(self):
+        return {
+            "obstacles": self.obstacle_pool.stats(),
+            "birds": self.bird_pool.stats(),
+            "bananas": self.banana_pool.stats(),
+            "platforms": self.platform_pool.stats(),
+        }
+
+    def run(self, seconds, dt=SIMULATION_DT):
+        # Step until the game ends or the given amount of game time has passed
+        steps = 0
+        while steps * dt < seconds and self.game_state == GameStates.PLAYING:
+            self.step(dt)
+            steps += 1
+        return steps
+
+    def step(self, delta_time):
+        # The caller begins the timer once a frame, so a frame's phases add up over all its steps
+        timer = self.phase_timer
+        if self.autopilot:
+            self.autopilot.update()
+        if self.recorder:
+            self.recorder.record_step(delta_time)
+        self.frame += 1
+        self.events = []
+        timer.mark("input")
+
+        if self.game_state == GameStates.GAMEOVER:
+            self.player_sprite.change_x = 0
+            self.player_sprite.texture = self.textures["monkey"]
+            return
+
+        self.player_speed = self.calculate_player_speed(PLAYER_SPEED, self.elapsed_time)
+
+        if self.monkey_state == MonkeyStates.JUMPING or self.monkey_state == MonkeyStates.SURFING:
+            if self.monkey_state == MonkeyStates.JUMPING:
+                self.player_sprite.texture = self.player_sprite_jumping
+            elif self.monkey_state == MonkeyStates.SURFING:
+                self.player_sprite.texture = self.player_sprite_surfing
+
+            # Break a floating platform the monkey jumps into from below
+            timer.mark("animation")
+            self.physics_engine.break_platforms_overhead()
+            timer.mark("physics")
+
+        elif self.monkey_state == MonkeyStates.RUNNING:
+            if self.monkey_clock.advance(delta_time):
+                self.player_sprite.texture = self.player_sprite_running[self.monkey_clock.frame]
+        timer.mark("animation")
+
+        # Ensure that monkey dosen't go off screen
+        top = hit_box_bounds(self.player_sprite)[3]
+        if top > SCREEN_HEIGHT:
+            self.player_sprite.center_y -= top - SCREEN_HEIGHT
+
+        if self.physics_engine.update(delta_time):
+            # Landed on a floating platform
+            self.monkey_state = MonkeyStates.RUNNING
+        else:
+            self.physics_engine.gravity_constant = GRAVITY
+        timer.mark("physics")
+
+        # Bird animation
+        animate_list(self.birds_list, self.bird_clock, self.bird_flying, delta_time)
+        timer.mark("animation")
+
+        # Update horizon and camera with new player speed
+        self.player_sprite.change_x = self.player_speed
+        self.camera_x = hit_box_bounds(self.player_sprite)[0] - 30
+
+        # Handle timer
+        self.elapsed_time += delta_time
+
+        # Move clouds
+        for cloud in self.clouds_list:
+            cloud.center_x += CLOUD_SPEED * delta_time
+            if hit_box_bounds(cloud)[1] < 0:
+                cloud.left = SCREEN_WIDTH + self.rng.randint(0, SCREEN_WIDTH // 2)
+                cloud.top = self.rng.randint(CLOUD_YPOS_MIN, CLOUD_YPOS_MAX)
+        timer.mark("clouds")
+
+        # Check for collisions with bananas, special bananas, and shield bananas
+        self.collect_bananas()
+
+        if self.special_banana_active and not self.shield_banana_active:
+            self.set_monkey_variant(MonkeyVariants.SPECIAL)
+            self.monkey_state = MonkeyStates.SURFING
+            self.physics_engine.gravity_constant = 0
+            self.special_banana_timer -= delta_time
+            if self.special_banana_timer <= 0:
+                self.special_banana_active = False
+                self.physics_engine.gravity_constant = GRAVITY
+                self.monkey_state = MonkeyStates.RUNNING
+        elif self.shield_banana_active and not self.special_banana_active:
+            self.set_monkey_variant(MonkeyVariants.SHIELD)
+            self.shield_banana_timer -= delta_time
+            if self.shield_banana_timer <= 0:
+                self.shield_banana_active = False
+        elif self.shield_banana_active and self.special_banana_active:
+            self.set_monkey_variant(MonkeyVariants.SPECIAL_SHIELD)
+            self.monkey_state = MonkeyStates.SURFING
+            self.physics_engine.gravity_constant = 0
+            self.shield_banana_timer -= delta_time
+            self.special_banana_timer -= delta_time
+            if self.shield_banana_timer <= 0:
+                self.shield_banana_active = False
+            if self.special_banana_timer <= 0:
+                self.special_banana_active = False
+                self.monkey_state = MonkeyStates.RUNNING
+                self.physics_engine.gravity_constant = GRAVITY
+        else:
+            self.set_monkey_variant(MonkeyVariants.NORMAL)
+        timer.mark("pickups")
+
+        # Check for collisions with obstacles
+        collisions = collides_with_list(self.player_sprite, self.obstacles_list)
+        for collision in collisions:
+            if not self.shield_banana_active:
+                self.events.append(GameEvents.OBSTACLE_HIT)
+                self.monkey_state = MonkeyStates.CRASHING
+                self.obstacle_pool.release(collision)
+                self.health -= 40  # Decrease health on collision with obstacle
+                self.health_x -= 20
+                if self.health <= 0:
+                    self.game_state = GameStates.GAMEOVER  # End game if health is gone
+                self.monkey_state = MonkeyStates.RUNNING
+            self.monkey_state = MonkeyStates.RUNNING
+
+
+        # Check for collisions with birds
+        collisions = collides_with_list(self.player_sprite, self.birds_list)
+        for collision in collisions:
+            if not self.shield_banana_active:
+                self.events.append(GameEvents.OBSTACLE_HIT)
+                self.monkey_state = MonkeyStates.CRASHING
+                self.bird_pool.release(collision)
+                self.health -= 40
+                self.health_x -= 20
+                if self.health <= 0:
+                    self.game_state = GameStates.GAMEOVER
+                self.monkey_state = MonkeyStates.RUNNING
+            self.monkey_state = MonkeyStates.RUNNING
+        timer.mark("obstacles")
+
+        # Continuous horizon handling
+        first_horizon_segment = self.horizon_list[0]
+        if hit_box_bounds(first_horizon_segment)[1] < self.camera_x:
+            last_horizon_segment = self.horizon_list[-1]
+            first_horizon_segment.left = last_horizon_segment.right
+            self.horizon_list.pop(0)
+            self.horizon_list.append(first_horizon_segment)
+
+        # Set textures based on the state
+        self.player_sprite.change_x = self.player_speed
+        self.camera_x = hit_box_bounds(self.player_sprite)[0] - 30
+        timer.mark("camera")
+
+        if self.game_state == GameStates.GAMEOVER:
+            self.events.append(GameEvents.GAME_OVER)
+
+        # Build what the generator laid out ahead, then retire what fell behind
+        self.spawn_ahead()
+        self.despawn_behind_camera()
+        timer.mark("spawning")
@@ -0,0 +1,71 @@
+import arcade
+import PIL.Image
+from enum import Enum
+
+from constants import ASSETS_PATH
+
+MonkeyVariants = Enum("MonkeyVariants", "NORMAL SPECIAL SHIELD SPECIAL_SHIELD")
+
+# Every animation frame, keyed by name; the file is the lower-case, dash-separated name
+TextureKeys = Enum(
+    "TextureKeys",
+    "MONKEY MONKEY2 MONKEY_JUMPING MONKEY_SURFING "
+    "SPECIAL_MONKEY SPECIAL_MONKEY2 SPECIAL_MONKEY_JUMPING SPECIAL_MONKEY_SURFING "
+    "SHIELD_MONKEY SHIELD_MONKEY2 SHIELD_MONKEY_JUMPING SHIELD_MONKEY_SURFING "
+    "SPECIAL_SHIELD_MONKEY SPECIAL_SHIELD_MONKEY2 SPECIAL_SHIELD_MONKEY_JUMPING SPECIAL_SHIELD_MONKEY_SURFING "
+    "BIRD BIRD2 PLATFORM BROKEN_PLATFORM "
+    "BANANA SPECIAL_BANANA SHIELD_BANANA JUNGLE_PLANT_1 JUNGLE_PLANT_2 JUNGLE_PLANT_3",
+)
+
+# (running frames, jumping, surfing) for each monkey power-up variant
+MONKEY_VARIANT_TEXTURES = {
+    MonkeyVariants.NORMAL: (
+        (TextureKeys.MONKEY, TextureKeys.MONKEY2), TextureKeys.MONKEY_JUMPING, TextureKeys.MONKEY_SURFING
+    ),
+    MonkeyVariants.SPECIAL: (
+        (TextureKeys.SPECIAL_MONKEY, TextureKeys.SPECIAL_MONKEY2),
+        TextureKeys.SPECIAL_MONKEY_JUMPING,
+        TextureKeys.SPECIAL_MONKEY_SURFING,
+    ),
+    MonkeyVariants.SHIELD: (
+        (TextureKeys.SHIELD_MONKEY, TextureKeys.SHIELD_MONKEY2),
+        TextureKeys.SHIELD_MONKEY_JUMPING,
+        TextureKeys.SHIELD_MONKEY_SURFING,
+    ),
+    MonkeyVariants.SPECIAL_SHIELD: (
+        (TextureKeys.SPECIAL_SHIELD_MONKEY, TextureKeys.SPECIAL_SHIELD_MONKEY2),
+        TextureKeys.SPECIAL_SHIELD_MONKEY_JUMPING,
+        TextureKeys.SPECIAL_SHIELD_MONKEY_SURFING,
+    ),
+}
+BIRD_FLYING_TEXTURES = (TextureKeys.BIRD, TextureKeys.BIRD2)
+OBSTACLE_TEXTURES = (TextureKeys.JUNGLE_PLANT_1, TextureKeys.JUNGLE_PLANT_2, TextureKeys.JUNGLE_PLANT_3)
+
+
+def texture_path(key):
+    return ASSETS_PATH / f"{key.name.lower().replace('_', '-')}.png"
+
+
+def load_texture_registry(loader=None):
+    # loader is an AssetBundle or HitBoxStore, so textures skip the PNG decode or the hit box scan
+    load_texture = loader.load_texture if loader else arcade.load_texture
+    return {key: load_texture(texture_path(key)) for key in TextureKeys}
+
+
+def uniform_keyframes(textures):
+    """
+    The frames of one animation on a shared canvas as large as the largest,
+    each centred on it, and all with the first frame's hit box. A sprite
+    then has the same size and hit box whichever frame it shows, so a
+    keyframe swap only changes which image is drawn.
+    """
+    width = max(texture.width for texture in textures)
+    height = max(texture.height for texture in textures)
+    frames = []
+    for texture in textures:
+        image = PIL.Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        image.paste(texture.image, ((width - texture.width) // 2, (height - texture.height) // 2))
+        frame = arcade.Texture(f"keyframe:{texture.name}", image=image, hit_box_algorithm="None")
+        frame._hit_box_points = textures[0].hit_box_points
+        frames.append(frame)
+    return frames
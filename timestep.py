@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+
+from constants import MAX_FRAME_TIME, SIMULATION_DT, SNAP_DISTANCE
+
+
+class FixedTimestep:
+    """
+    Steps a Simulation at a fixed rate from frames of any length. Frame time
+    builds up in an accumulator and is spent one whole step at a time, with
+    the remainder carried over to the next frame, so the game runs at the
+    same speed at any frame rate and a slow frame is caught up with extra
+    steps. No more than MAX_FRAME_TIME is caught up from one frame, so a
+    stall cannot snowball.
+
+    Between steps, interpolated() draws the player, the clouds and the
+    camera part of the way from where the last step found them to where it
+    left them, by how far the remainder is into the next step.
+    """
+
+    def __init__(self, sim, dt=SIMULATION_DT, max_frame_time=MAX_FRAME_TIME):
+        self.sim = sim
+        self.dt = dt
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def reset(self):
+        # Call after every sim.reset(), so a new game is not drawn sliding in from the last one
+        self.accumulator = 0.0
+        self.capture()
+
+    def sprites(self):
+        return [self.sim.player_sprite, *self.sim.clouds_list]
+
+    def capture(self):
+        self.previous_positions = [sprite.position for sprite in self.sprites()]
+        self.previous_camera_x = self.sim.camera_x
+
+    def advance(self, delta_time):
+        """
+        Spend delta_time on as many whole steps as it covers. Returns every
+        event those steps raised, in order, and the number of steps taken.
+        """
+        self.accumulator += min(delta_time, self.max_frame_time)
+        events = []
+        steps = 0
+        # A hair of tolerance, so a frame two steps long is not one step and a rounding error
+        while self.accumulator >= self.dt * (1 - 1e-9):
+            self.capture()
+            self.sim.step(self.dt)
+            events.extend(self.sim.events)
+            self.accumulator -= self.dt
+            steps += 1
+        self.accumulator = max(self.accumulator, 0.0)
+        return events, steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
+
+    @contextmanager
+    def interpolated(self):
+        """
+        Move the sprites to their interpolated positions for drawing, and
+        back to where the simulation left them afterwards. Yields the
+        interpolated camera x. A sprite that moved further than SNAP_DISTANCE
+        in the last step, such as a cloud wrapping around, is drawn where it
+        landed.
+        """
+        alpha = self.alpha
+        sprites = self.sprites()
+        current = [sprite.position for sprite in sprites]
+        for sprite, (previous_x, previous_y), (x, y) in zip(sprites, self.previous_positions, current):
+            if abs(x - previous_x) + abs(y - previous_y) < SNAP_DISTANCE:
+                sprite.position = (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
+        camera_x = self.sim.camera_x
+        if abs(camera_x - self.previous_camera_x) < SNAP_DISTANCE:
+            camera_x = self.previous_camera_x + (camera_x - self.previous_camera_x) * alpha
+        try:
+            yield camera_x
+        finally:
+            for sprite, position in zip(sprites, current):
+                sprite.position = position
@@ -0,0 +1,251 @@
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
+from enum import Enum
+
+from constants import CHUNK_WIDTH, LEVEL_WIDTH_PIXELS, SPAWN_DISTANCE
+from textures import OBSTACLE_TEXTURES, TextureKeys
+
+Entities = Enum("Entities", "OBSTACLE BIRD BANANA PLATFORM")
+Lanes = Enum("Lanes", "GROUND MID_AIR SKY")
+
+# One entity to spawn, as plain data: what it is, its texture, and where its hit box's left and bottom go
+Placement = namedtuple("Placement", "entity texture_key left bottom")
+
+# The horizontal band each entity occupies. Obstacles and ground bananas share
+# the ground, platforms are mid-air and birds fly in the sky above them.
+ENTITY_LANES = {
+    Entities.OBSTACLE: Lanes.GROUND,
+    Entities.BANANA: Lanes.GROUND,
+    Entities.PLATFORM: Lanes.MID_AIR,
+    Entities.BIRD: Lanes.SKY,
+}
+
+BANANA_TEXTURES = (TextureKeys.BANANA, TextureKeys.SPECIAL_BANANA, TextureKeys.SHIELD_BANANA)
+BANANA_WEIGHTS = (0.6, 0.2, 0.2)
+# Random gap after each entity, on top of its width
+SPACING = {
+    Entities.OBSTACLE: (300, 400),
+    Entities.BIRD: (500, 600),
+    Entities.BANANA: (200, 300),
+    Entities.PLATFORM: (300, 500),
+}
+# Entities come in runs SPAWN_DISTANCE long with a gap this long after each, the
+# rhythm the level has always had. Birds were topped up whenever fewer than three
+# were left, so they never had gaps.
+RUN_GAPS = {
+    Entities.OBSTACLE: SPAWN_DISTANCE,
+    Entities.BIRD: 0,
+    Entities.BANANA: SPAWN_DISTANCE,
+    Entities.PLATFORM: SPAWN_DISTANCE,
+}
+
+
+class Footprint:
+    """
+    The size of one texture at the scale it is spawned with: the sprite's
+    width, which spaces entities out, and its hit box's width and height,
+    which decide overlaps.
+    """
+
+    def __init__(self, texture, scale=1):
+        xs = [point[0] * scale for point in texture.hit_box_points]
+        ys = [point[1] * scale for point in texture.hit_box_points]
+        self.width = texture.width * scale
+        self.hit_box_left = min(xs)
+        self.hit_box_width = max(xs) - min(xs)
+        self.hit_box_height = max(ys) - min(ys)
+
+
+class IntervalIndex:
+    """
+    The x-ranges taken in one lane, merged into sorted, disjoint intervals.
+    Touching ranges do not overlap. add() is a binary search; fit_right()
+    and fit_left() find where to start with one and then walk the intervals
+    in the way, which stays short because a lane only holds the chunk being
+    generated and the one before it.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, left, right):
+        # Merge with every interval it overlaps or touches
+        i = bisect_left(self.ends, left)
+        j = bisect_right(self.starts, right)
+        if i < j:
+            left = min(left, self.starts[i])
+            right = max(right, self.ends[j - 1])
+        self.starts[i:j] = [left]
+        self.ends[i:j] = [right]
+
+    def fit_right(self, left, width):
+        # The nearest left at or after this one where width fits, stepping over
+        # each interval in the way and the gap after it when width does not fit there
+        i = bisect_right(self.ends, left)
+        while i < len(self.starts) and self.starts[i] < left + width:
+            left = self.ends[i]
+            i += 1
+        return left
+
+    def fit_left(self, left, width):
+        # The nearest left at or before this one where width fits, walking back the same way
+        i = bisect_left(self.starts, left + width) - 1
+        while i >= 0 and self.ends[i] > left:
+            left = self.starts[i] - width
+            i -= 1
+        return left
+
+    def discard_before(self, x):
+        # Drop the intervals that end at or before x
+        i = bisect_right(self.ends, x)
+        del self.starts[:i]
+        del self.ends[:i]
+
+
+class ChunkedWorldGenerator:
+    """
+    Lays the level out in fixed-width chunks as plain Placements, well ahead
+    of the camera, without building any sprites. The simulation then takes
+    them from pending a few per step, so spawning never builds a whole
+    screen of sprites in one step.
+
+    Each entity type keeps its own cursor across chunks, so spacing carries
+    on seamlessly from one chunk to the next. The first run reaches
+    LEVEL_WIDTH_PIXELS, as the first screens always have. Overlaps are
+    resolved against an IntervalIndex per lane: an obstacle moves right and
+    a ground banana moves left to the nearest free room, and platforms and
+    birds move right past whatever takes the lane above or below.
+    """
+
+    lane_index = IntervalIndex
+
+    def __init__(self, rng, footprints, start_x, chunk_width=CHUNK_WIDTH, spacing=SPACING):
+        self.rng = rng
+        self.footprints = footprints
+        self.chunk_width = chunk_width
+        self.spacing = spacing
+        self.generated_until = start_x
+        self.cursors = dict.fromkeys(Entities, start_x)
+        self.run_ends = dict.fromkeys(Entities, LEVEL_WIDTH_PIXELS)
+        self.frontiers = dict.fromkeys(Entities, start_x)
+        self.pending = deque()
+        self.lanes = {lane: self.lane_index() for lane in Lanes}
+
+    def generate_until(self, x):
+        while self.generated_until < x:
+            self.generate_chunk()
+
+    def generate_chunk(self):
+        chunk_start = self.generated_until
+        chunk_end = chunk_start + self.chunk_width
+        # Only this chunk and the one before can still overlap what is placed next
+        for lane in self.lanes.values():
+            lane.discard_before(chunk_start - self.chunk_width)
+
+        placements = []
+        self.place_obstacles(chunk_end, placements)
+        self.place_birds(chunk_end, placements)
+        self.place_bananas(chunk_end, placements)
+        self.place_platforms(chunk_end, placements)
+        placements.sort(key=lambda placement: placement.left)
+        self.pending.extend(placements)
+        self.generated_until = chunk_end
+
+    def next_run(self, entity, xpos):
+        # Past the end of a run, the next one starts RUN_GAPS after the furthest hit box
+        if xpos < self.run_ends[entity]:
+            return xpos
+        xpos = max(xpos, self.frontiers[entity] + RUN_GAPS[entity])
+        self.run_ends[entity] = xpos + SPAWN_DISTANCE
+        return xpos
+
+    def gap(self, entity):
+        return self.rng.randint(*self.spacing[entity])
+
+    def add(self, placements, entity, texture_key, left, bottom):
+        right = left + self.footprints[texture_key].hit_box_width
+        self.lanes[ENTITY_LANES[entity]].add(left, right)
+        self.frontiers[entity] = max(self.frontiers[entity], right)
+        placements.append(Placement(entity, texture_key, left, bottom))
+
+    def place_obstacles(self, chunk_end, placements):
+        ground = self.lanes[Lanes.GROUND]
+        xpos = self.cursors[Entities.OBSTACLE]
+        while xpos < chunk_end:
+            xpos = self.next_run(Entities.OBSTACLE, xpos)
+            if xpos >= chunk_end:
+                break
+            texture_key = self.rng.choice(OBSTACLE_TEXTURES)
+            footprint = self.footprints[texture_key]
+
+            # No overlap with bananas
+            left = ground.fit_right(xpos, footprint.hit_box_width)
+            xpos += footprint.width + self.gap(Entities.OBSTACLE)
+            self.add(placements, Entities.OBSTACLE, texture_key, left, 30)
+        self.cursors[Entities.OBSTACLE] = xpos
+
+    def place_bananas(self, chunk_end, placements):
+        ground = self.lanes[Lanes.GROUND]
+        xpos = self.cursors[Entities.BANANA]
+        while xpos < chunk_end:
+            xpos = self.next_run(Entities.BANANA, xpos)
+            if xpos >= chunk_end:
+                break
+            texture_key = self.rng.choices(BANANA_TEXTURES, weights=BANANA_WEIGHTS)[0]
+            footprint = self.footprints[texture_key]
+            left = xpos
+            xpos += footprint.width + self.gap(Entities.BANANA)
+
+            # No overlap with obstacles
+            left = ground.fit_left(left, footprint.hit_box_width)
+            self.add(placements, Entities.BANANA, texture_key, left, 30)
+        self.cursors[Entities.BANANA] = xpos
+
+    def place_platforms(self, chunk_end, placements):
+        sky = self.lanes[Lanes.SKY]
+        xpos = self.cursors[Entities.PLATFORM]
+        footprint = self.footprints[TextureKeys.PLATFORM]
+        banana = self.footprints[TextureKeys.BANANA]
+        while xpos < chunk_end:
+            xpos = self.next_run(Entities.PLATFORM, xpos)
+            if xpos >= chunk_end:
+                break
+            bottom = self.rng.randint(200, 300)
+
+            # No overlap with birds
+            left = sky.fit_right(xpos, footprint.hit_box_width)
+            self.add(placements, Entities.PLATFORM, TextureKeys.PLATFORM, left, bottom)
+
+            # Bananas on the platform, centred 80 and 230 px in from its left edge
+            for i in range(self.rng.randint(1, 2)):
+                center_x = left + i * 150 + 80
+                placements.append(
+                    Placement(
+                        Entities.BANANA,
+                        TextureKeys.BANANA,
+                        center_x + banana.hit_box_left,
+                        bottom + footprint.hit_box_height + 10,
+                    )
+                )
+            xpos = left + footprint.width + self.gap(Entities.PLATFORM)
+        self.cursors[Entities.PLATFORM] = xpos
+
+    def place_birds(self, chunk_end, placements):
+        mid_air = self.lanes[Lanes.MID_AIR]
+        xpos = self.cursors[Entities.BIRD]
+        footprint = self.footprints[TextureKeys.BIRD]
+        while xpos < chunk_end:
+            xpos = self.next_run(Entities.BIRD, xpos)
+            if xpos >= chunk_end:
+                break
+            bottom = self.rng.randint(300, 400)
+
+            # No overlap with floating platforms
+            left = mid_air.fit_right(xpos, footprint.hit_box_width)
+            xpos = left + footprint.width + self.gap(Entities.BIRD)
+            self.add(placements, Entities.BIRD, TextureKeys.BIRD, left, bottom)
+        self.cursors[Entities.BIRD] = xpos